@@ -0,0 +1,58 @@
+"""Shared helpers for benchmarks that run the API against the fake server."""
+import os
+import socket
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_openai(token_delay_ms: float = 10, first_token_delay_ms: float = 200,
+                      fail_rate: float = 0.0) -> str:
+    """Run the fake completions server in a background thread; returns its base URL.
+
+    Must be called before importing `config`, which reads OPENAI_BASE_URL.
+    """
+    import uvicorn
+    from benchmarks import fake_openai_server
+
+    fake_openai_server.configure(token_delay_ms, first_token_delay_ms, fail_rate)
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(fake_openai_server.app, host="127.0.0.1", port=port,
+                                           log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+
+    base_url = f"http://127.0.0.1:{port}/v1"
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    return base_url
+
+
+def start_api(cache_dir: str) -> str:
+    """Run the API in a background thread with its own cache; returns its base URL.
+
+    Call start_fake_openai first so the API talks to the fake upstream.
+    """
+    import uvicorn
+
+    os.environ["CACHE_DIR"] = cache_dir
+    os.environ["STATIC_BUNDLE_DIR"] = os.path.join(cache_dir, "static_bundle")
+    from main import app
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
@@ -0,0 +1,103 @@
+"""Compare cache entry size and decode time: JSON vs the binary cache codec.
+
+Samples come from an existing cache directory when one is given, otherwise
+from schema-shaped fake payloads like the fake completions server returns.
+Memory per entry is the stored payload size; decode time is per entry.
+The last rows time CacheService.get itself, from the memory LRU and from disk.
+
+Usage: python benchmarks/codec_benchmark.py [--cache-dir cache] [--entries 500]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fake_openai_server import _fake_value
+
+
+def load_samples(args):
+    from models.schemas import StrongsAnalysis
+    from services.cache_service import CacheService
+    from services.prompts import STRONGS_ANALYSIS_SCHEMA
+
+    if args.cache_dir:
+        cache = CacheService(args.cache_dir)
+        samples = [(CacheService.MODELS[kind], entry["data"])
+                   for kind in CacheService.MODELS
+                   for _, entry in cache.entries(kind)]
+        return samples[:args.entries]
+
+    rng = random.Random(0)
+    return [(StrongsAnalysis, StrongsAnalysis(**_fake_value(STRONGS_ANALYSIS_SCHEMA, rng)).model_dump())
+            for _ in range(args.entries)]
+
+
+def per_entry_us(fn, items, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            fn(*item)
+    return (time.perf_counter() - start) / (repeat * len(items)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--entries", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from services import codec
+
+    samples = load_samples(args)
+    if not samples:
+        print("No samples")
+        return
+    train, test = samples[::2], samples[1::2] or samples
+    dictionary = codec.train_dictionary(train)
+
+    as_json = [(cls, json.dumps(cls(**data).model_dump()).encode("utf-8")) for cls, data in test]
+    raw = [(cls, codec.encode(cls, data, compress=False)) for cls, data in test]
+    compressed = [(cls, codec.encode(cls, data)) for cls, data in test]
+    with_dictionary = [(cls, codec.encode(cls, data, dictionary)) for cls, data in test]
+
+    print(f"{len(test)} entries, dictionary {len(dictionary)} bytes trained on {len(train)}")
+    print(f"{'format':<26}{'bytes/entry':>12}")
+    for name, blobs in (("model_dump + json.dumps", as_json), ("codec", raw),
+                        ("codec + zlib", compressed), ("codec + zlib + dictionary", with_dictionary)):
+        print(f"{name:<26}{sum(len(blob) for _, blob in blobs) / len(blobs):>12.0f}")
+
+    timings = {
+        "json.loads + validate": (lambda cls, blob: cls(**json.loads(blob)), as_json),
+        "json.loads": (lambda cls, blob: json.loads(blob), as_json),
+        "codec trusted": (lambda cls, blob: codec.decode(cls, blob), raw),
+        "codec trusted + zlib": (lambda cls, blob: codec.decode(cls, blob), compressed),
+        "codec + dictionary": (lambda cls, blob: codec.decode(cls, blob, dictionary), with_dictionary),
+        "codec + validate": (lambda cls, blob: codec.decode_model(cls, blob), raw),
+    }
+    print(f"\n{'decode':<26}{'us/entry':>12}")
+    for name, (fn, blobs) in timings.items():
+        print(f"{name:<26}{per_entry_us(fn, blobs, args.repeat):>12.1f}")
+
+    from services.cache_service import CacheService
+    kinds = {cls: kind for kind, cls in CacheService.MODELS.items()}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = CacheService(cache_dir)
+        cache.install_dictionary(dictionary)
+        keys = [(kinds[cls], f"BENCH/{i}") for i, (cls, _) in enumerate(test)]
+        for (kind, key), (_, data) in zip(keys, test):
+            cache.set(kind, key, data)
+        cold = per_entry_us(CacheService(cache_dir, memory_entries=0).get, keys, args.repeat)
+        for key in keys:
+            cache.get(*key)
+        warm = per_entry_us(cache.get, keys, args.repeat)
+    print(f"{'CacheService.get memory':<26}{warm:>12.1f}")
+    print(f"{'CacheService.get disk':<26}{cold:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
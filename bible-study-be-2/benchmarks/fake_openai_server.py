@@ -0,0 +1,150 @@
+"""OpenAI-compatible fake chat completions server for local benchmarks.
+
+Streams deterministic output at a configurable token rate: marker-formatted
+text for chapter intros and schema-conforming JSON for structured requests.
+Point the API at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+
+Usage: python benchmarks/fake_openai_server.py [--port 8100] [--token-delay-ms 10]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = ("grace covenant faith light spirit word promise people land law mercy "
+         "kingdom righteous heart servant glory truth prophet temple blessing").split()
+INTRO_MARKERS = ["MAIN_HEADING", "TIMELINE_INFO", "CULTURAL_CONTEXT", "WHAT_MIGHT_SEEM_STRANGE",
+                 "KEY_INSIGHTS", "WHY_THIS_MATTERS_TODAY"]
+CHARS_PER_TOKEN = 4
+
+app = FastAPI()
+app.state.token_delay = 0.01
+app.state.first_token_delay = 0.2
+app.state.fail_rate = 0.0
+app.state.stats = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "models": {}}
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _fake_value(schema: dict, rng: random.Random):
+    if schema.get("type") == "object":
+        return {key: _fake_value(value, rng) for key, value in schema["properties"].items()}
+    if schema.get("type") == "array":
+        count = schema.get("minItems", 1)
+        return [_fake_value(schema["items"], rng) for _ in range(count)]
+    return _sentence(rng, rng.randint(4, 24))
+
+
+def _fake_intro(rng: random.Random, markers) -> str:
+    parts = []
+    for marker in markers:
+        length = 8 if marker in ("MAIN_HEADING", "TIMELINE_INFO") else 120
+        parts.append(f"[{marker}]\n{_sentence(rng, length)}\n[/{marker}]")
+    return "\n\n".join(parts)
+
+
+def _completion_text(body: dict) -> str:
+    prompt = "".join(str(message.get("content", "")) for message in body.get("messages", []))
+    rng = random.Random(prompt)
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        return json.dumps(_fake_value(response_format["json_schema"]["schema"], rng))
+    # The latest user message naming markers decides which sections to write
+    for message in reversed(body.get("messages", [])):
+        requested = [marker for marker in INTRO_MARKERS if f"[{marker}]" in str(message.get("content", ""))]
+        if message.get("role") == "user" and requested:
+            return _fake_intro(rng, requested)
+    return _fake_intro(rng, INTRO_MARKERS)
+
+
+def _chunk(completion_id: str, model: str, delta: dict, finish_reason=None, usage=None) -> str:
+    payload = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [] if usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    if usage:
+        payload["usage"] = usage
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    text = _completion_text(body)
+    prompt_tokens = sum(len(str(message.get("content", ""))) for message in body.get("messages", [])) // CHARS_PER_TOKEN
+    completion_tokens = max(len(text) // CHARS_PER_TOKEN, 1)
+    model = body.get("model", "fake")
+    stats = app.state.stats
+    model_stats = stats["models"].setdefault(model, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+    for counters in (stats, model_stats):
+        counters["calls"] += 1
+        counters["prompt_tokens"] += prompt_tokens
+        counters["completion_tokens"] += completion_tokens
+
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    fail_at = len(text) // 2 if random.random() < app.state.fail_rate else None
+
+    async def events():
+        await asyncio.sleep(app.state.first_token_delay)
+        yield _chunk(completion_id, model, {"role": "assistant", "content": ""})
+        for start in range(0, len(text), CHARS_PER_TOKEN):
+            if fail_at is not None and start >= fail_at:
+                raise RuntimeError("injected upstream failure")
+            await asyncio.sleep(app.state.token_delay)
+            yield _chunk(completion_id, model, {"content": text[start:start + CHARS_PER_TOKEN]})
+        yield _chunk(completion_id, model, {}, finish_reason="stop")
+        if (body.get("stream_options") or {}).get("include_usage"):
+            yield _chunk(completion_id, model, {}, usage={
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            })
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/stats")
+async def stats():
+    return JSONResponse(app.state.stats)
+
+
+@app.post("/stats/reset")
+async def reset_stats():
+    app.state.stats = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "models": {}}
+    return JSONResponse(app.state.stats)
+
+
+def configure(token_delay_ms: float = 10, first_token_delay_ms: float = 200, fail_rate: float = 0.0):
+    app.state.token_delay = token_delay_ms / 1000
+    app.state.first_token_delay = first_token_delay_ms / 1000
+    app.state.fail_rate = fail_rate
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--token-delay-ms", type=float, default=10)
+    parser.add_argument("--first-token-delay-ms", type=float, default=200)
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="fraction of streams that break halfway through")
+    args = parser.parse_args()
+
+    configure(args.token_delay_ms, args.first_token_delay_ms, args.fail_rate)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare chapter intro latency: one sequential call vs concurrent section calls.
+
+Every run generates a fresh intro against the fake completions server.
+Reports time to the first section event, time until every section is
+written, and upstream tokens and cost per intro at CHAPTER_INTRO_MODEL
+pricing. The fake server does not model prompt caching, which matches the
+provider here: the intro prompt is under its 1024-token caching minimum.
+
+Usage: python benchmarks/intro_benchmark.py [--intros 3] [--token-delay-ms 10]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks._harness import start_fake_openai
+from benchmarks.replay_load import MODEL_PRICING
+
+
+async def measure(events) -> dict:
+    start = time.perf_counter()
+    first_section = None
+    async for event in events:
+        if first_section is None and event["type"] in ("header_update", "section_update"):
+            first_section = time.perf_counter() - start
+        if event["type"] == "error":
+            raise RuntimeError(event["message"])
+    return {"first_section_ms": first_section * 1000, "complete_ms": (time.perf_counter() - start) * 1000}
+
+
+async def run(args):
+    from benchmarks import fake_openai_server
+    from services.bible_service import BibleService
+    from services.cache_service import CacheService
+    from services.prompts import CHAPTER_INTRO_MODEL
+
+    input_rate, output_rate = MODEL_PRICING[CHAPTER_INTRO_MODEL]
+    service = BibleService()
+    print(f"{'mode':<12} {'first section ms':>17} {'complete ms':>12} {'prompt tok':>11} {'output tok':>11} "
+          f"{'cost $':>9}")
+    for mode, parallel in (("sequential", False), ("parallel", True)):
+        fake_openai_server.app.state.stats = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "models": {}}
+        results = []
+        for i in range(args.intros):
+            # A fresh cache per intro keeps every request a live generation
+            service.cache_service = CacheService(tempfile.mkdtemp())
+            results.append(await measure(service.get_chapter_intro_stream("GEN", i + 1, parallel=parallel)))
+        stats = fake_openai_server.app.state.stats
+        prompt_tokens, completion_tokens = stats["prompt_tokens"] / args.intros, stats["completion_tokens"] / args.intros
+        cost = (prompt_tokens * input_rate + completion_tokens * output_rate) / 1_000_000
+        print(f"{mode:<12} {statistics.median(r['first_section_ms'] for r in results):>17.1f} "
+              f"{statistics.median(r['complete_ms'] for r in results):>12.1f} "
+              f"{prompt_tokens:>11.0f} {completion_tokens:>11.0f} {cost:>9.5f}")
+    await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--intros", type=int, default=3, help="intros per mode")
+    parser.add_argument("--token-delay-ms", type=float, default=10)
+    parser.add_argument("--first-token-delay-ms", type=float, default=200)
+    args = parser.parse_args()
+
+    start_fake_openai(token_delay_ms=args.token_delay_ms, first_token_delay_ms=args.first_token_delay_ms)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
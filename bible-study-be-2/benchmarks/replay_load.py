@@ -0,0 +1,297 @@
+"""Replay production usage traces against a local API backed by the fake server.
+
+Traces are read from token usage logs (JSON records separated by dashed
+lines) and application logs (`<function> - Tokens:` lines, or upstream
+`HTTP Request: POST` lines when those are all a log has). Records without
+a book/chapter/word get one drawn from the Zipf fit described below.
+
+The replay keeps the recorded arrival gaps, divided by --speed, with idle
+periods capped at --max-gap seconds first. With --requests beyond the
+trace length, extra arrivals reuse the recorded gaps. Their keys follow a
+Zipf distribution over the observed keys ranked by popularity, so the
+hot-word skew of real clicks is preserved.
+
+Usage: python benchmarks/replay_load.py [--speed 10] [--requests 200] [--url http://127.0.0.1:8000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import Counter
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+from urllib.parse import quote, urlsplit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+from benchmarks._harness import start_api, start_fake_openai
+
+DEFAULT_TRACES = [
+    os.path.join(BACKEND_DIR, "..", "bible-study-be", "token_usage_log.txt"),
+    os.path.join(BACKEND_DIR, "bible_study_usage.log"),
+]
+
+# USD per million tokens (input, output)
+MODEL_PRICING = {"gpt-4o": (2.50, 10.00), "gpt-4o-mini": (0.15, 0.60)}
+
+INTRO_FUNCTIONS = {"get_bible_chapter_intro", "get_chapter_intro_stream"}
+STRONGS_FUNCTIONS = {"get_strongs_word", "get_strongs_analysis_stream"}
+LOG_LINE = re.compile(r"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),(\d+) - \w+ - (.*)$")
+FUNCTION_LINE = re.compile(r"^(\w+) - Tokens:")
+EVENT_TYPE = re.compile(rb'^data: \{"type": "(\w+)"', re.MULTILINE)
+# Events only sent while a model is generating; cached tiers arrive as tier_complete
+GENERATED_EVENTS = {b"content", b"content_reset", b"field_content", b"field_content_reset",
+                    b"section_update", b"header_update"}
+
+
+class TraceRequest(NamedTuple):
+    timestamp: float
+    kind: Optional[str]  # "chapter_intro", "strongs" or None when unknown
+    book: Optional[str] = None
+    chapter: Optional[int] = None
+    word: Optional[str] = None
+
+    @property
+    def key(self):
+        return (self.kind, self.book, self.chapter, self.word)
+
+
+def _kind(function: str) -> Optional[str]:
+    if function in INTRO_FUNCTIONS:
+        return "chapter_intro"
+    if function in STRONGS_FUNCTIONS:
+        return "strongs"
+    return None
+
+
+def parse_token_log(path: str) -> List[TraceRequest]:
+    requests = []
+    with open(path, "r", encoding="utf-8") as f:
+        for block in re.split(r"^-{10,}$", f.read(), flags=re.MULTILINE):
+            try:
+                record = json.loads(block)
+            except ValueError:
+                continue
+            kind = _kind(record.get("function", ""))
+            if kind is None:
+                continue
+            requests.append(TraceRequest(
+                datetime.fromisoformat(record["timestamp"]).timestamp(), kind,
+                record.get("book"), record.get("chapter"), record.get("word") if kind == "strongs" else None
+            ))
+    return requests
+
+
+def parse_app_log(path: str) -> List[TraceRequest]:
+    function_calls, upstream_calls = [], []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            match = LOG_LINE.match(line.strip())
+            if not match:
+                continue
+            timestamp = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S").timestamp() + int(match.group(2)) / 1000
+            message = match.group(3)
+            function = FUNCTION_LINE.match(message)
+            if function and _kind(function.group(1)):
+                function_calls.append(TraceRequest(timestamp, _kind(function.group(1))))
+            elif message.startswith("HTTP Request: POST") and "chat/completions" in message:
+                upstream_calls.append(TraceRequest(timestamp, None))
+    # Both line types describe the same calls; prefer the ones that carry a kind
+    return function_calls or upstream_calls
+
+
+def load_traces(paths: List[str]) -> List[TraceRequest]:
+    requests = []
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"skipping missing trace {path}")
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            head = f.read(64).lstrip()
+        requests.extend(parse_token_log(path) if head.startswith("{") else parse_app_log(path))
+    return sorted(requests, key=lambda request: request.timestamp)
+
+
+class ZipfKeys:
+    """Samples request keys by popularity rank: P(rank r) is proportional to 1 / r**s."""
+
+    def __init__(self, requests: List[TraceRequest], s: float, rng: random.Random):
+        counts = Counter(request.key for request in requests if request.book)
+        if not counts:
+            counts = Counter({("strongs", "GEN", 1, "light"): 1, ("chapter_intro", "GEN", 1, None): 1})
+        self.keys = [key for key, _ in counts.most_common()]
+        self.weights = [1 / (rank ** s) for rank in range(1, len(self.keys) + 1)]
+        kinds = Counter(request.kind for request in requests if request.kind)
+        self.kind_share = {kind: count / sum(kinds.values()) for kind, count in kinds.items()}
+        self.rng = rng
+
+    def sample(self, kind: Optional[str] = None):
+        keys, weights = self.keys, self.weights
+        if kind is not None:
+            matching = [(key, weight) for key, weight in zip(keys, weights) if key[0] == kind]
+            if matching:
+                keys, weights = zip(*matching)
+        return self.rng.choices(keys, weights)[0]
+
+
+def build_schedule(requests: List[TraceRequest], total: int, speed: float, max_gap: float,
+                   zipf: ZipfKeys, rng: random.Random):
+    """Return [(offset seconds, key)] for the replay."""
+    gaps = [min(later.timestamp - earlier.timestamp, max_gap)
+            for earlier, later in zip(requests, requests[1:])] or [1.0]
+    schedule, offset = [], 0.0
+    for index in range(total):
+        if index < len(requests):
+            request = requests[index]
+            key = request.key if request.book else zipf.sample(request.kind)
+            if index:
+                offset += gaps[index - 1] / speed
+        else:
+            key = zipf.sample()
+            offset += rng.choice(gaps) / speed
+        schedule.append((offset, key))
+    return schedule
+
+
+def request_path(key) -> str:
+    kind, book, chapter, word = key
+    if kind == "chapter_intro":
+        return f"/api/v1/chapter-info/{book}/{chapter}"
+    return f"/api/v1/strongs-info/{book}/{chapter}/{quote(word or 'word', safe='')}"
+
+
+async def fetch(base_url: str, path: str) -> dict:
+    """GET a streaming endpoint; returns latencies and its cache outcome."""
+    url = urlsplit(base_url)
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {url.netloc}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+
+    first_byte, body = None, bytearray()
+    status_line = await reader.readline()
+    while (await reader.readline()) not in (b"\r\n", b""):
+        pass
+    while True:
+        chunk = await reader.read(65536)
+        if not chunk:
+            break
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+        body += chunk
+    writer.close()
+
+    total = time.perf_counter() - start
+    return {
+        "ok": b" 200 " in status_line and b'"type": "error"' not in body,
+        "cache": cache_outcome(body),
+        "ttfb": first_byte if first_byte is not None else total,
+        "total": total,
+    }
+
+
+def cache_outcome(body: bytes) -> str:
+    """'hit' when a response completes with nothing generated first, 'partial'
+    when only the fast tier was cached and the deep tier was deferred, else 'miss'."""
+    for match in EVENT_TYPE.finditer(body):
+        event_type = match.group(1)
+        if event_type in GENERATED_EVENTS:
+            return "miss"
+        if event_type == b"complete":
+            line_end = body.find(b"\n", match.end())
+            deferred = b'"deferred":' in body[match.end():line_end if line_end != -1 else None]
+            return "partial" if deferred else "hit"
+    return "miss"
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)] * 1000 if values else 0.0
+
+
+def upstream_stats(fake_url: str, reset: bool = False) -> dict:
+    root = fake_url.rsplit("/v1", 1)[0]
+    request = urllib.request.Request(f"{root}/stats/reset" if reset else f"{root}/stats",
+                                     method="POST" if reset else "GET")
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+async def replay(base_url: str, schedule) -> List[dict]:
+    start = time.perf_counter()
+
+    async def run(offset: float, key):
+        await asyncio.sleep(max(offset - (time.perf_counter() - start), 0))
+        try:
+            return await fetch(base_url, request_path(key))
+        except OSError:
+            return {"ok": False, "cache": "miss", "ttfb": 0.0, "total": 0.0}
+
+    return await asyncio.gather(*(run(offset, key) for offset, key in schedule))
+
+
+def report(results: List[dict], upstream: Optional[dict], elapsed: float):
+    ok = [result for result in results if result["ok"]]
+    hits = sum(result["cache"] == "hit" for result in ok)
+    partial = sum(result["cache"] == "partial" for result in ok)
+    print(f"requests      {len(results)} ({len(results) - len(ok)} failed) in {elapsed:.1f}s")
+    print(f"cache hits    {hits} ({hits / max(len(ok), 1):.1%}), "
+          f"{partial} more with the deep tier deferred")
+    for metric in ("ttfb", "total"):
+        values = [result[metric] for result in ok]
+        print(f"{metric:<13} p50 {percentile(values, 0.5):8.1f} ms  p90 {percentile(values, 0.9):8.1f} ms  "
+              f"p99 {percentile(values, 0.99):8.1f} ms")
+    if upstream is None:
+        return
+    cost = 0.0
+    for model, counters in upstream.get("models", {}).items():
+        input_rate, output_rate = MODEL_PRICING.get(model, MODEL_PRICING["gpt-4o"])
+        cost += counters["prompt_tokens"] / 1_000_000 * input_rate + counters["completion_tokens"] / 1_000_000 * output_rate
+    print(f"upstream      {upstream['calls']} calls, {upstream['prompt_tokens']} prompt + "
+          f"{upstream['completion_tokens']} completion tokens (fake-server estimates)")
+    print(f"est. cost     ${cost:.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trace", action="append", help="trace file; repeatable (default: repo logs)")
+    parser.add_argument("--speed", type=float, default=10, help="replay speed-up factor, e.g. 1 to 100")
+    parser.add_argument("--max-gap", type=float, default=30, help="cap on recorded idle gaps, in seconds")
+    parser.add_argument("--requests", type=int, help="number of requests (default: trace length)")
+    parser.add_argument("--zipf-s", type=float, default=1.0, help="Zipf exponent for key popularity")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="existing API instance; default starts one with the fake server")
+    parser.add_argument("--token-delay-ms", type=float, default=10)
+    parser.add_argument("--fake-url", help="fake server base URL, for upstream stats with --url")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    requests = load_traces(args.trace or DEFAULT_TRACES)
+    if not requests:
+        sys.exit("no requests found in traces")
+    zipf = ZipfKeys(requests, args.zipf_s, rng)
+    schedule = build_schedule(requests, args.requests or len(requests), args.speed, args.max_gap, zipf, rng)
+    print(f"{len(requests)} traced requests, {len(zipf.keys)} distinct keys, "
+          f"replaying {len(schedule)} over {schedule[-1][0]:.1f}s")
+
+    fake_url = args.fake_url
+    base_url = args.url
+    if base_url is None:
+        fake_url = start_fake_openai(token_delay_ms=args.token_delay_ms)
+        base_url = start_api(tempfile.mkdtemp(prefix="replay-cache-"))
+    if fake_url:
+        upstream_stats(fake_url, reset=True)
+
+    start = time.perf_counter()
+    results = asyncio.run(replay(base_url, schedule))
+    report(results, upstream_stats(fake_url) if fake_url else None, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Compare bytes on the wire and body writes per stream for SSE output modes.
+
+Every chunk a StreamingResponse body yields is sent as one ASGI
+`http.response.body` message, which the server writes to the socket with
+one send syscall, so chunks per stream is the write-syscall count.
+
+Usage: python benchmarks/sse_benchmark.py [--streams 3] [--token-delay-ms 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks._harness import start_fake_openai
+
+
+async def legacy_frames(events):
+    """The original per-event encoding, one write per frame."""
+    async for event in events:
+        yield f"data: {json.dumps(event)}\n\n".encode("utf-8")
+
+
+async def measure(body) -> dict:
+    start = time.perf_counter()
+    first_byte = None
+    writes = 0
+    size = 0
+    async for chunk in body:
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+        writes += 1
+        size += len(chunk)
+    return {"writes": writes, "bytes": size, "ttfb_ms": first_byte * 1000,
+            "total_ms": (time.perf_counter() - start) * 1000}
+
+
+async def run(args):
+    from services.bible_service import BibleService
+    from services.cache_service import CacheService
+    from services.sse import SSEWriter, brotli
+
+    modes = {
+        "legacy per-frame": None,
+        "writer, no batching": SSEWriter(coalesce_ms=0),
+        f"batched {args.coalesce_ms:g}ms": SSEWriter(coalesce_ms=args.coalesce_ms),
+        f"batched {args.coalesce_ms:g}ms + gzip": SSEWriter(coalesce_ms=args.coalesce_ms, encoding="gzip"),
+    }
+    if brotli is not None:
+        modes[f"batched {args.coalesce_ms:g}ms + br"] = SSEWriter(coalesce_ms=args.coalesce_ms, encoding="br")
+
+    service = BibleService()
+    streams = {
+        "strongs": lambda i: service.get_strongs_analysis_stream("GEN", 1, f"word{i}"),
+        "intro": lambda i: service.get_chapter_intro_stream("GEN", i + 1),
+    }
+
+    print(f"{'stream':<8} {'mode':<26} {'writes':>8} {'bytes':>9} {'ttfb ms':>9} {'total ms':>9}")
+    for stream_name, make_events in streams.items():
+        for mode_name, writer in modes.items():
+            results = []
+            for i in range(args.streams):
+                # A fresh cache per stream keeps every request a live generation
+                service.cache_service = CacheService(tempfile.mkdtemp())
+                events = make_events(i)
+                body = legacy_frames(events) if writer is None else writer.stream(events)
+                results.append(await measure(body))
+            averages = {key: sum(result[key] for result in results) / len(results) for key in results[0]}
+            print(f"{stream_name:<8} {mode_name:<26} {averages['writes']:>8.0f} {averages['bytes']:>9.0f} "
+                  f"{averages['ttfb_ms']:>9.1f} {averages['total_ms']:>9.1f}")
+    await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--streams", type=int, default=3, help="streams per mode")
+    parser.add_argument("--token-delay-ms", type=float, default=10)
+    parser.add_argument("--coalesce-ms", type=float, default=25)
+    args = parser.parse_args()
+
+    start_fake_openai(token_delay_ms=args.token_delay_ms, first_token_delay_ms=50)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
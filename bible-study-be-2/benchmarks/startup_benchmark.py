@@ -0,0 +1,54 @@
+"""Measure API process cold start: module import time and lifespan startup.
+
+Each run uses a fresh interpreter so nothing is already imported.
+
+Usage: python benchmarks/startup_benchmark.py [--runs 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import asyncio, json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def startup():
+    async with main.app.router.lifespan_context(main.app):
+        ready = time.perf_counter()
+    return ready
+
+ready = asyncio.run(startup())
+print(json.dumps({"import_ms": (imported - start) * 1000, "ready_ms": (ready - start) * 1000}))
+"""
+
+
+def run_once() -> dict:
+    env = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "benchmark")}
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    for metric in ("import_ms", "ready_ms"):
+        values = [result[metric] for result in results]
+        print(f"{metric:>10}: median {statistics.median(values):8.1f}  "
+              f"min {min(values):8.1f}  max {max(values):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,5 +5,61 @@ load_dotenv()
 
 class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")
     LOG_FILE = "bible_study_usage.log"
-    TOKEN_USAGE_LOG = "token_usage_log.txt"
\ No newline at end of file
+    TOKEN_USAGE_LOG = "token_usage_log.txt"
+    CACHE_DIR = os.getenv("CACHE_DIR", "cache")
+    # Entries are held inflated, a few KB each; compression is only applied on disk
+    CACHE_MEMORY_ENTRIES = int(os.getenv("CACHE_MEMORY_ENTRIES", "20000"))
+    # Generate the sections of a chapter intro as concurrent calls instead of one. Off by
+    # default: about 3.7x faster to complete, but every call resends the intro prompt, which is
+    # too short to be prompt-cached, so input tokens rise about 5x (744 to 3874 per intro).
+    CHAPTER_INTRO_PARALLEL = os.getenv("CHAPTER_INTRO_PARALLEL", "").lower() in ("1", "true", "yes")
+    STREAM_MAX_RETRIES = int(os.getenv("STREAM_MAX_RETRIES", "2"))
+    # Jittered exponential backoff between retries of a failed upstream call, in seconds
+    STREAM_RETRY_BACKOFF = float(os.getenv("STREAM_RETRY_BACKOFF", "0.5"))
+    STREAM_RETRY_BACKOFF_MAX = float(os.getenv("STREAM_RETRY_BACKOFF_MAX", "8"))
+    STATIC_BUNDLE_DIR = os.getenv("STATIC_BUNDLE_DIR", "static_bundle")
+    SESSION_MAX_CONCURRENT_JOBS = int(os.getenv("SESSION_MAX_CONCURRENT_JOBS", "3"))
+    SESSION_IDLE_TIMEOUT = float(os.getenv("SESSION_IDLE_TIMEOUT", "300"))
+    SESSION_KEEPALIVE_INTERVAL = float(os.getenv("SESSION_KEEPALIVE_INTERVAL", "15"))
+    # Undelivered events a session holds before the job producing more is cancelled
+    SESSION_EVENT_BUFFER = int(os.getenv("SESSION_EVENT_BUFFER", "1000"))
+    # Extra room for job lifecycle events; beyond it the oldest undelivered events are dropped
+    SESSION_LIFECYCLE_BUFFER = int(os.getenv("SESSION_LIFECYCLE_BUFFER", "200"))
+    # Queued or running jobs per session, and live sessions; more are rejected
+    SESSION_MAX_JOBS = int(os.getenv("SESSION_MAX_JOBS", "50"))
+    SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+    SSE_COALESCE_MS = float(os.getenv("SSE_COALESCE_MS", "25"))
+    SSE_COALESCE_BYTES = int(os.getenv("SSE_COALESCE_BYTES", "4096"))
+    SSE_COMPRESSION = os.getenv("SSE_COMPRESSION", "")  # "", "gzip", "br" or "auto"
+    # Admin endpoints require ADMIN_HEADER: ADMIN_TOKEN and are disabled while no token is set
+    ADMIN_HEADER = os.getenv("ADMIN_HEADER", "X-Admin-Token")
+    ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+    REVALIDATE_PER_MINUTE = float(os.getenv("REVALIDATE_PER_MINUTE", "6"))
+    # Sampling profiler; requests carrying PROFILE_HEADER: PROFILE_TOKEN are profiled, and the
+    # /admin/profile endpoints require it. With no token both are off.
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+    PROFILE_HEADER = os.getenv("PROFILE_HEADER", "X-Profile")
+    PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+    PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+    PROFILE_MAX_WINDOW = float(os.getenv("PROFILE_MAX_WINDOW", "300"))
+    PROFILE_MAX_REQUESTS = int(os.getenv("PROFILE_MAX_REQUESTS", "4"))
+    PROFILE_MAX_DEPTH = int(os.getenv("PROFILE_MAX_DEPTH", "64"))
+    PROFILE_MAX_STACKS = int(os.getenv("PROFILE_MAX_STACKS", "20000"))
+    LEXICON_FILE = os.getenv("LEXICON_FILE", os.path.join(os.path.dirname(__file__), "data", "gloss_strongs.json"))
+    # Chapter text quoted in verse-scoped prompts; fill it with import_verses.py
+    VERSE_STORE_DIR = os.getenv("VERSE_STORE_DIR", "verses")
+    # Verses on each side of a clicked verse included in Strong's prompts
+    STRONGS_VERSE_WINDOW = int(os.getenv("STRONGS_VERSE_WINDOW", "1"))
+    MODEL_CONCURRENCY = int(os.getenv("MODEL_CONCURRENCY", "8"))
+    SCHEDULER_WEIGHT_INTERACTIVE = float(os.getenv("SCHEDULER_WEIGHT_INTERACTIVE", "8"))
+    SCHEDULER_WEIGHT_PREFETCH = float(os.getenv("SCHEDULER_WEIGHT_PREFETCH", "3"))
+    SCHEDULER_WEIGHT_BULK = float(os.getenv("SCHEDULER_WEIGHT_BULK", "1"))
+    SCHEDULER_INTERACTIVE_RESERVE = int(os.getenv("SCHEDULER_INTERACTIVE_RESERVE", "2"))
+    SCHEDULER_PREEMPT_DEPTH = int(os.getenv("SCHEDULER_PREEMPT_DEPTH", "1"))
+    SCHEDULER_DEADLINES = {
+        "interactive": float(os.getenv("SCHEDULER_DEADLINE_INTERACTIVE", "30")),
+        "prefetch": float(os.getenv("SCHEDULER_DEADLINE_PREFETCH", "60")),
+        "bulk": None,
+    }
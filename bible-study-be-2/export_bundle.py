@@ -0,0 +1,22 @@
+"""Export cached chapter intros and Strong's analyses as a static bundle.
+
+Usage: python export_bundle.py [--cache-dir cache] [--out static_bundle]
+"""
+import argparse
+from config import Config
+from services.cache_service import CacheService
+from services.static_bundle import export_bundle
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cache-dir", default=Config.CACHE_DIR)
+    parser.add_argument("--out", default=Config.STATIC_BUNDLE_DIR)
+    args = parser.parse_args()
+
+    manifest = export_bundle(CacheService(args.cache_dir), args.out)
+    print(f"Exported {len(manifest['routes'])} routes to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
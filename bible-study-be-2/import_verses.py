@@ -0,0 +1,99 @@
+"""Import Bible text into the verse store from the Free Use Bible API.
+
+The reader shows chapters from bible.helloao.org, so verse-scoped Strong's
+prompts quote the same translation by default. Each chapter is written to
+VERSE_STORE_DIR/<BOOK>/<chapter>.json. `--source` also accepts a local
+directory laid out like the API (<translation>/books.json and
+<translation>/<BOOK>/<chapter>.json) for offline imports.
+
+`--strongs FILE` also imports a Strong's alignment of the same
+translation, which the lexicon prefers over its gloss table. The file is
+tab-separated, one translated word or phrase per line:
+`JHN 21:15<TAB>lovest<TAB>G25`, e.g. exported from the Berean
+translation tables for BSB. When a phrase carries several numbers, the
+last is used; prefixed particles and object markers come first.
+
+Usage: python import_verses.py [--translation BSB] [--books GEN,JHN] [--out verses] [--source URL_OR_DIR]
+                               [--strongs FILE] [--force]
+"""
+import argparse
+import json
+import os
+import re
+import urllib.request
+from collections import defaultdict
+from config import Config
+from services.verse_store import VerseStore
+
+DEFAULT_SOURCE = "https://bible.helloao.org/api"
+REFERENCE = re.compile(r"^\s*(\w+)\s+(\d+):(\d+)\s*$")
+STRONGS = re.compile(r"([HG])0*(\d+)", re.IGNORECASE)
+
+
+def load_json(source: str, path: str):
+    if os.path.isdir(source):
+        with open(os.path.join(source, *path.split("/")), "r", encoding="utf-8") as f:
+            return json.load(f)
+    with urllib.request.urlopen(f"{source.rstrip('/')}/{path}", timeout=30) as response:
+        return json.load(response)
+
+
+def load_strongs_tags(path: str, wanted: set):
+    """Read an alignment file into {(BOOK, chapter): {verse: [(English, number)]}}."""
+    tags = defaultdict(lambda: defaultdict(list))
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            columns = line.rstrip("\n").split("\t")
+            if len(columns) < 3 or line.startswith("#"):
+                continue
+            reference, numbers = REFERENCE.match(columns[0]), STRONGS.findall(columns[2])
+            if reference is None or not numbers or not columns[1].strip():
+                continue  # header rows and untranslated words
+            book = reference.group(1).upper()
+            if wanted and book not in wanted:
+                continue
+            prefix, number = numbers[-1]
+            tags[(book, int(reference.group(2)))][int(reference.group(3))].append(
+                (columns[1].strip(), f"{prefix.upper()}{number}")
+            )
+    return tags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--translation", default="BSB")
+    parser.add_argument("--books", default="", help="comma-separated book ids; all books by default")
+    parser.add_argument("--out", default=Config.VERSE_STORE_DIR)
+    parser.add_argument("--source", default=DEFAULT_SOURCE)
+    parser.add_argument("--strongs", help="tab-separated Strong's alignment of the same translation")
+    parser.add_argument("--force", action="store_true", help="overwrite chapters already imported")
+    args = parser.parse_args()
+
+    store = VerseStore(args.out)
+    wanted = {book.strip().upper() for book in args.books.split(",") if book.strip()}
+    books = [book for book in load_json(args.source, f"{args.translation}/books.json")["books"]
+             if not wanted or book["id"].upper() in wanted]
+
+    imported = verses = 0
+    for book in books:
+        for chapter in range(1, book["numberOfChapters"] + 1):
+            if not args.force and os.path.exists(os.path.join(args.out, book["id"].upper(), f"{chapter}.json")):
+                continue
+            chapter_verses = VerseStore.verses_from_api(
+                load_json(args.source, f"{args.translation}/{book['id']}/{chapter}.json")
+            )
+            store.save_chapter(book["id"], chapter, chapter_verses)
+            imported += 1
+            verses += len(chapter_verses)
+        print(f"{book['id']}: {book['numberOfChapters']} chapters")
+    print(f"Imported {imported} chapters ({verses} verses) of {args.translation} to {args.out}")
+
+    if args.strongs:
+        tags = load_strongs_tags(args.strongs, wanted)
+        for (book, chapter), chapter_tags in tags.items():
+            store.save_strongs_tags(book, chapter, chapter_tags)
+        print(f"Imported Strong's alignments for {len(tags)} chapters")
+
+
+if __name__ == "__main__":
+    main()
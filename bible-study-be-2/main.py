@@ -1,11 +1,41 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from routes.admin_routes import router as admin_router
 from routes.bible_routes import router as bible_router
+from routes.session_routes import router as session_router
+from services.bible_service import BibleService
+from services.logging_service import configure_logging, shutdown_logging
+from services.profiler import ProfilerMiddleware, SamplingProfiler
+from services.revalidation_service import Revalidator
+from services.session_service import SessionManager
+from services.static_bundle import StaticBundle
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create services on startup and release their resources on shutdown."""
+    configure_logging()
+    app.state.bible_service = BibleService()
+    app.state.revalidator = Revalidator(app.state.bible_service)
+    app.state.bible_service.revalidator = app.state.revalidator
+    app.state.revalidator.start()
+    app.state.static_bundle = StaticBundle()
+    app.state.session_manager = SessionManager(app.state.bible_service)
+    app.state.profiler = SamplingProfiler()
+    try:
+        yield
+    finally:
+        app.state.profiler.stop_window()
+        await app.state.session_manager.close_all()
+        await app.state.revalidator.stop()
+        await app.state.bible_service.close()
+        shutdown_logging()
 
 app = FastAPI(
     title="Bible Study API",
     description="Streaming Bible chapter introductions and Strong's analysis",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -16,9 +46,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ProfilerMiddleware)
 
 # Include routers
 app.include_router(bible_router, prefix="/api/v1", tags=["Bible Study"])
+app.include_router(session_router, prefix="/api/v1", tags=["Reader Sessions"])
+app.include_router(admin_router, prefix="/api/v1", tags=["Admin"])
 
 @app.get("/")
 async def root():
@@ -27,4 +60,3 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "bible-study-api"}
-
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 from datetime import datetime
 
 class OriginalLanguageInfo(BaseModel):
@@ -36,6 +36,14 @@ class StrongsAnalysis(BaseModel):
     contextual_meaning: ContextualMeaning
     biblical_usage_examples: List[BiblicalUsageExample]
 
+class StrongsGloss(BaseModel):
+    original_language_info: OriginalLanguageInfo
+    contextual_meaning: ContextualMeaning
+
+class StrongsDetail(BaseModel):
+    general_meanings: List[GeneralMeaning]
+    biblical_usage_examples: List[BiblicalUsageExample]
+
 class ChapterParagraph(BaseModel):
     title: str
     content: str
@@ -62,4 +70,18 @@ class LogEntry(BaseModel):
     chapter: int
     word: Optional[str]
     tokens: TokenUsage
-    cost: CostData
\ No newline at end of file
+    cost: CostData
+class SessionJobRequest(BaseModel):
+    kind: Literal["chapter_intro", "strongs"]
+    book: str
+    chapter: int
+    word: Optional[str] = None
+    verse: Optional[int] = Field(default=None, ge=1)
+    deep: bool = True
+    parallel: Optional[bool] = None
+    priority: int = 0
+    scheduling: Literal["interactive", "prefetch"] = "interactive"
+
+class SessionJobResponse(BaseModel):
+    session_id: str
+    job_id: str
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from routes.dependencies import get_bible_service, get_profiler, get_revalidator, require_admin, \
+    require_profile_token
+from services.bible_service import BibleService
+from services.profiler import ProfilerUnavailable, SamplingProfiler
+from services.revalidation_service import Revalidator
+
+router = APIRouter()
+
+@router.post("/admin/revalidate", dependencies=[Depends(require_admin)])
+async def revalidate_stale(revalidator: Revalidator = Depends(get_revalidator)):
+    """Queue background regeneration of every cache entry from an old content version."""
+    queued = await revalidator.enqueue_stale()
+    return {"queued": queued, "pending": revalidator.pending}
+
+@router.get("/admin/scheduler", dependencies=[Depends(require_admin)])
+async def scheduler_stats(bible_service: BibleService = Depends(get_bible_service)):
+    """Queue depth, running calls and queue wait times per scheduling class."""
+    return bible_service.scheduler.stats()
+
+@router.post("/admin/profile", dependencies=[Depends(require_profile_token)])
+async def start_profile(seconds: float = Query(30, gt=0), profiler: SamplingProfiler = Depends(get_profiler)):
+    """Sample every request for a time window; the profile is written to disk when it closes."""
+    try:
+        seconds = profiler.start_window(seconds)
+    except ProfilerUnavailable as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"seconds": seconds, **profiler.status()}
+
+@router.delete("/admin/profile", dependencies=[Depends(require_profile_token)])
+async def stop_profile(profiler: SamplingProfiler = Depends(get_profiler)):
+    """Close the profiling window early and write its profile."""
+    return {"profile": profiler.stop_window()}
+
+@router.get("/admin/profile", dependencies=[Depends(require_profile_token)])
+async def profile_status(profiler: SamplingProfiler = Depends(get_profiler)):
+    """Whether a profiling window is open, and the most recent profile files."""
+    return profiler.status()
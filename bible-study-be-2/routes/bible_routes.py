@@ -1,36 +1,87 @@
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
-from services.bible_service import BibleService
+from routes.dependencies import get_bible_service, get_static_bundle
+from services.bible_service import FAST_TIER, STRONGS_TIERS, BibleService
+from services.prompts import CHAPTER_INTRO_VERSION, STRONGS_VERSE_VERSION, STRONGS_VERSION, content_versions
+from services.sse import SSEWriter
+from services.static_bundle import StaticBundle
 
 router = APIRouter()
-bible_service = BibleService()
 
 @router.get("/chapter-info/{book}/{chapter}")
-async def stream_chapter_info(book: str, chapter: int):
-    """Stream chapter introduction with real-time updates."""
+async def stream_chapter_info(request: Request, book: str, chapter: int, parallel: Optional[bool] = None,
+                              bible_service: BibleService = Depends(get_bible_service),
+                              static_bundle: StaticBundle = Depends(get_static_bundle)):
+    """Stream chapter introduction with real-time updates.
+
+    `parallel` overrides CHAPTER_INTRO_PARALLEL for this request.
+    """
+    static_response = static_bundle.route_response(
+        request, f"/chapter-info/{book.upper()}/{chapter}", CHAPTER_INTRO_VERSION
+    )
+    if static_response is not None:
+        return static_response
+
+    writer = SSEWriter.for_request(request.headers.get("accept-encoding", ""))
     return StreamingResponse(
-        bible_service.get_chapter_intro_stream(book, chapter),
+        writer.stream(bible_service.get_chapter_intro_stream(book, chapter, parallel=parallel)),
         media_type="text/plain",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "Access-Control-Allow-Origin": "*",
             "Access-Control-Allow-Headers": "*",
-            "Access-Control-Allow-Methods": "*"
+            "Access-Control-Allow-Methods": "*",
+            **writer.headers
         }
     )
 
 @router.get("/strongs-info/{book}/{chapter}/{word}")
-async def stream_strongs_info(book: str, chapter: int, word: str):
-    """Stream Strong's analysis with real-time updates."""
+async def stream_strongs_info(request: Request, book: str, chapter: int, word: str,
+                              verse: Optional[int] = Query(None, ge=1),
+                              deep: bool = True,
+                              bible_service: BibleService = Depends(get_bible_service),
+                              static_bundle: StaticBundle = Depends(get_static_bundle)):
+    """Stream Strong's analysis with real-time updates.
+
+    With `verse`, the contextual meaning is specific to that verse.
+    `deep=false` returns only the quick gloss tier.
+    """
+    route = f"/strongs-info/{bible_service.strongs_cache_key(book, chapter, word)}"
+    if verse is None:
+        static_response = static_bundle.route_response(request, route, STRONGS_VERSION)
+    else:
+        static_response = static_bundle.route_response(request, f"{route}/{verse}", STRONGS_VERSE_VERSION)
+    if static_response is not None:
+        return static_response
+
+    writer = SSEWriter.for_request(request.headers.get("accept-encoding", ""))
     return StreamingResponse(
-        bible_service.get_strongs_analysis_stream(book, chapter, word),
+        writer.stream(bible_service.get_strongs_analysis_stream(
+            book, chapter, word, verse=verse, tiers=STRONGS_TIERS if deep else (FAST_TIER,)
+        )),
         media_type="text/plain",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "Access-Control-Allow-Origin": "*",
             "Access-Control-Allow-Headers": "*",
-            "Access-Control-Allow-Methods": "*"
+            "Access-Control-Allow-Methods": "*",
+            **writer.headers
         }
     )
+
+@router.get("/bundle/objects/{digest}")
+async def bundle_object(request: Request, digest: str,
+                        static_bundle: StaticBundle = Depends(get_static_bundle)):
+    """Serve a content-addressed object from the exported static bundle."""
+    response = static_bundle.object_response(request, digest)
+    if response is None:
+        raise HTTPException(status_code=404, detail="Object not found")
+    return response
+
+@router.get("/content-versions")
+async def get_content_versions():
+    """Model and prompt/schema version currently used for each content type."""
+    return content_versions()
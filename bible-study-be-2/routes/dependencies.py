@@ -0,0 +1,44 @@
+import hmac
+from fastapi import HTTPException, Request
+from config import Config
+from services.bible_service import BibleService
+from services.profiler import SamplingProfiler
+from services.revalidation_service import Revalidator
+from services.session_service import SessionManager
+from services.static_bundle import StaticBundle
+
+
+def get_bible_service(request: Request) -> BibleService:
+    """Return the BibleService created during application startup."""
+    return request.app.state.bible_service
+
+def get_static_bundle(request: Request) -> StaticBundle:
+    """Return the StaticBundle created during application startup."""
+    return request.app.state.static_bundle
+
+def get_session_manager(request: Request) -> SessionManager:
+    """Return the SessionManager created during application startup."""
+    return request.app.state.session_manager
+
+def get_revalidator(request: Request) -> Revalidator:
+    """Return the Revalidator started during application startup."""
+    return request.app.state.revalidator
+
+def get_profiler(request: Request) -> SamplingProfiler:
+    """Return the SamplingProfiler created during application startup."""
+    return request.app.state.profiler
+
+def check_token(request: Request, header: str, token: str):
+    """Reject the request unless `header` carries `token`; an unset token disables the endpoint."""
+    if not token:
+        raise HTTPException(status_code=403, detail="Endpoint disabled: no access token is configured")
+    if not hmac.compare_digest(request.headers.get(header, "").encode(), token.encode()):
+        raise HTTPException(status_code=401, detail=f"Missing or invalid {header} header")
+
+def require_admin(request: Request):
+    """Guard for admin endpoints: the ADMIN_HEADER header must carry ADMIN_TOKEN."""
+    check_token(request, Config.ADMIN_HEADER, Config.ADMIN_TOKEN)
+
+def require_profile_token(request: Request):
+    """Guard for the profiler endpoints: the PROFILE_HEADER header must carry PROFILE_TOKEN."""
+    check_token(request, Config.PROFILE_HEADER, Config.PROFILE_TOKEN)
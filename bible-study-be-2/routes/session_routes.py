@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Request
+from fastapi.responses import StreamingResponse
+from models.schemas import SessionJobRequest, SessionJobResponse
+from routes.dependencies import get_session_manager
+from services.session_service import SessionBusy, SessionLimitReached, SessionManager
+from services.sse import SSEWriter
+
+router = APIRouter()
+
+SESSION_ID = Path(..., min_length=1, max_length=64, pattern=r"^[A-Za-z0-9_-]+$")
+
+@router.get("/sessions/{session_id}/events")
+async def session_events(request: Request, session_id: str = SESSION_ID,
+                         session_manager: SessionManager = Depends(get_session_manager)):
+    """Single event stream carrying every job submitted to the session; one subscriber at a time."""
+    try:
+        session = await session_manager.get(session_id)
+        events = session.stream()
+    except SessionLimitReached as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except SessionBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    writer = SSEWriter.for_request(request.headers.get("accept-encoding", ""))
+    return StreamingResponse(
+        writer.stream(events),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+            **writer.headers
+        }
+    )
+
+@router.post("/sessions/{session_id}/jobs", response_model=SessionJobResponse)
+async def submit_session_job(job_request: SessionJobRequest, session_id: str = SESSION_ID,
+                             session_manager: SessionManager = Depends(get_session_manager)):
+    """Queue a chapter-intro or Strong's job; its events arrive on the session stream."""
+    try:
+        session = await session_manager.get(session_id)
+    except SessionLimitReached as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    try:
+        job_id = await session.submit(job_request)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except SessionLimitReached as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return SessionJobResponse(session_id=session_id, job_id=job_id)
+
+@router.delete("/sessions/{session_id}/jobs/{job_id}")
+async def cancel_session_job(job_id: str, session_id: str = SESSION_ID,
+                             session_manager: SessionManager = Depends(get_session_manager)):
+    """Cancel a queued or running job."""
+    session = session_manager.find(session_id)
+    if session is None or not session.cancel(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"session_id": session_id, "job_id": job_id, "cancelled": True}
@@ -1,167 +1,498 @@
 # services/bible_service.py
+import asyncio
+import functools
 import json
-from typing import AsyncGenerator, Dict, Any
-from openai import OpenAI
+import logging
+import random
+import re
+from contextlib import aclosing
+from typing import AsyncGenerator, Callable, Dict, Any, List, Optional, Sequence, Tuple
 from config import Config
-from models.schemas import ChapterIntro, StrongsAnalysis
+from models.schemas import ChapterIntro, StrongsAnalysis, StrongsDetail, StrongsGloss
+from services.cache_service import CacheService
+from services.lexicon_service import LexiconService
 from services.logging_service import LoggingService
+from services.prompts import (
+    CHAPTER_INTRO_MODEL, CHAPTER_INTRO_PROMPT, CHAPTER_INTRO_VERSION, INTRO_SECTION_GROUPS, INTRO_SECTION_PROMPT,
+    INTRO_SECTIONS,
+    STRONGS_ANALYSIS_SCHEMA, STRONGS_DEEP_FIELDS, STRONGS_DEEP_VERSION, STRONGS_FAST_FIELDS, STRONGS_FAST_MODEL,
+    STRONGS_FAST_VERSION, STRONGS_MODEL, STRONGS_NUMBER_HINT, STRONGS_PROMPT, STRONGS_VERSE_PROMPT,
+    STRONGS_VERSE_VERSION, STRONGS_VERSION
+)
+from services.scheduler_service import BULK, INTERACTIVE, ModelScheduler, SchedulerError
+from services.verse_store import VerseStore
+
+FAST_TIER = "fast"
+DEEP_TIER = "deep"
+STRONGS_TIERS = (FAST_TIER, DEEP_TIER)
+
+STRONGS_NUMBER = re.compile(r"^[HG]\d+$")
+
+
+def _buffered(method):
+    """Run an event generator in its own task, buffering its events without bound.
+
+    Generators that hold a scheduler slot while streaming from upstream are
+    wrapped in this, so a slow reader never keeps the slot: the upstream is
+    drained at its own pace and the slot is released when the call ends.
+    The buffer holds at most one generation's events. Closing the wrapper
+    cancels the task.
+    """
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs) -> AsyncGenerator[Dict[str, Any], None]:
+        events: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async with aclosing(method(*args, **kwargs)) as source:
+                    async for event in source:
+                        events.put_nowait(event)
+            finally:
+                events.put_nowait(done)
 
+        task = asyncio.create_task(pump())
+        try:
+            while (event := await events.get()) is not done:
+                yield event
+            # Surface errors raised by the generator
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
 
+    return wrapper
 
 
 class BibleService:
     def __init__(self):
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        self._client = None
         self.logging_service = LoggingService()
+        self.cache_service = CacheService()
+        self.lexicon_service = LexiconService()
+        self.verse_store = VerseStore()
+        self.scheduler = ModelScheduler()
+        # Set at startup; regenerates stale cache entries in the background
+        self.revalidator = None
+
+    @property
+    def client(self):
+        """OpenAI client, created on first use so startup never pays for it."""
+        if self._client is None:
+            # Imported here: the SDK accounts for most of the process import time
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=Config.OPENAI_API_KEY, base_url=Config.OPENAI_BASE_URL)
+        return self._client
+
+    async def close(self):
+        """Close the HTTP connection pool of the client, if one was created."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def get_chapter_intro_stream(self, book: str, chapter: int, refresh: bool = False,
+                                       priority: str = INTERACTIVE,
+                                       parallel: Optional[bool] = None) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream chapter introduction with true incremental streaming.
+
+        Every completed section is checkpointed. If the upstream stream fails,
+        generation resumes from what was already written instead of starting
+        over, both within this request and on the next request for the chapter.
+
+        A cached intro from an older content version is still served, and a
+        background regeneration is queued. `refresh` bypasses the cache.
+        The model call waits for a scheduler slot of the given `priority`.
+
+        In `parallel` mode (default CHAPTER_INTRO_PARALLEL) each group of
+        INTRO_SECTION_GROUPS is its own concurrent call, so latency is
+        bounded by the longest section rather than the sum. Each call sends
+        the whole intro prompt, which is too short for the provider's prompt
+        cache, so an intro costs about five times the input tokens. It falls
+        back to one call when the scheduler has too few free slots.
+        """
+        cache_key = self.cache_service.intro_key(book, chapter)
+        request = {"book": book, "chapter": chapter}
+        cached_intro = None if refresh else self.cache_service.get_entry(CacheService.CHAPTER_INTRO, cache_key)
+        if cached_intro is not None:
+            if cached_intro["version"] != CHAPTER_INTRO_VERSION:
+                self._revalidate(CacheService.CHAPTER_INTRO, cache_key, request)
+            yield {'type': 'complete', 'data': cached_intro["data"]}
+            return
+
+        usage_data = {}
+        final_sections: Dict[str, str] = {}
+        if parallel is None:
+            parallel = Config.CHAPTER_INTRO_PARALLEL
+        if parallel and self.scheduler.available(priority) >= len(INTRO_SECTION_GROUPS):
+            sections = self._parallel_intro_sections(book, chapter, cache_key, priority, usage_data, final_sections)
+        else:
+            sections = self._sequential_intro_sections(book, chapter, cache_key, priority, usage_data, final_sections)
+        async for event in sections:
+            yield event
+            if event['type'] == 'error':
+                return
+
+        # Build final structured data
+        sections_data = {
+            "MainHeading": final_sections.get("MainHeading", ""),
+            "TimelineInfo": final_sections.get("TimelineInfo", ""),
+            "Paras": []
+        }
 
-    async def get_chapter_intro_stream(self, book: str, chapter: int) -> AsyncGenerator[str, None]:
-        """Stream chapter introduction with true incremental streaming."""
-        
-        messages = [
-            {
-                "role": "user",
-                "content": f"""
-You are a faithful biblical scholar and devoted guide helping someone understand the sacred richness of **{book} {chapter}**. Your goal is to provide reverent cultural context and spiritual insights that make God's Word more meaningful and accessible, especially addressing any difficult or challenging passages that modern readers might struggle with, inviting deeper exploration of His truth even in hard-to-understand verses.
-
-Create a warm, faith-affirming introduction that says "Here's what will help God's Word come alive for you in this chapter."
-
-Please structure your response EXACTLY as follows, with clear section markers:
-
-[MAIN_HEADING]
-A thoughtful, engaging title (6–10 words) that captures the chapter's essence and addresses any challenging content. If the chapter contains difficult passages, craft a heading that acknowledges the complexity while remaining faith-affirming. Think: "Understanding God's Heart in Hard Passages" or "Ancient Laws, Eternal Love" - informative but pastorally sensitive.
-[/MAIN_HEADING]
+        for section_name in ["CulturalContext", "WhatMightSeemStrange", "KeyInsights", "WhyThisMattersToday"]:
+            if section_name in final_sections and final_sections[section_name]:
+                sections_data["Paras"].append({
+                    "title": self._section_name_to_title(section_name),
+                    "content": final_sections[section_name]
+                })
 
-[TIMELINE_INFO]
-The historical period (e.g., "c. 1000–960 BCE") with brief context if helpful.
-[/TIMELINE_INFO]
+        # Validate the complete response
+        try:
+            validated_intro = ChapterIntro(**sections_data)
+
+            # Log usage if available
+            if usage_data:
+                cost_data = self.logging_service.calculate_cost(
+                    usage_data.get("prompt_tokens", 0),
+                    usage_data.get("completion_tokens", 0)
+                )
+                self.logging_service.log_token_usage(
+                    "get_chapter_intro_stream", book, chapter, None, usage_data, cost_data
+                )
+
+            self.cache_service.set(
+                CacheService.CHAPTER_INTRO, cache_key, validated_intro.model_dump(), CHAPTER_INTRO_VERSION, request
+            )
+            self.cache_service.delete(CacheService.INTRO_CHECKPOINT, cache_key)
 
-[CULTURAL_CONTEXT]
-Explain the historical and cultural backdrop that God was working within. What customs, beliefs, or social structures help us understand how the Lord was moving among His people? Help readers see God's providence through the lens of ancient times while honoring the divine inspiration of Scripture.
-[/CULTURAL_CONTEXT]
+            # Send completion signal with validated data
+            yield {'type': 'complete', 'data': validated_intro.model_dump()}
 
-[WHAT_MIGHT_SEEM_STRANGE]
-Acknowledge elements that modern readers might find unfamiliar or difficult to understand, while affirming that God's Word is perfect and timeless. Pay special attention to passages that may seem challenging to contemporary readers (like laws about slavery, violence, or ancient customs). Gently explain how these difficult passages reveal God's character, His progressive revelation, and His work within the cultural context of the time, helping readers understand the deeper spiritual truths without compromising biblical authority.
-[/WHAT_MIGHT_SEEM_STRANGE]
+        except Exception as e:
+            yield {'type': 'error', 'message': f'Validation error: {str(e)}'}
+
+    @_buffered
+    async def _sequential_intro_sections(self, book: str, chapter: int, cache_key: str, priority: str,
+                                         usage_data: Dict[str, int],
+                                         final_sections: Dict[str, str]) -> AsyncGenerator[Dict[str, Any], None]:
+        """Generate every section in one call, filling `final_sections` unless an error is yielded."""
+        checkpoint = self._get_checkpoint(CacheService.INTRO_CHECKPOINT, cache_key, CHAPTER_INTRO_VERSION)
+        accumulated_content = checkpoint.get("content", "")
+        checkpointed_length = len(accumulated_content)
+        sections_data = {}
+
+        # Track what we've already sent to avoid duplicates
+        sent_content = {section_name: "" for section_name in INTRO_SECTIONS}
+
+        # Replay sections restored from a checkpoint
+        for event in self._section_events(accumulated_content, sent_content, sections_data):
+            yield event
+
+        retries = 0
+        try:
+            async with self.scheduler.slot(priority, Config.SCHEDULER_DEADLINES[priority]):
+                while True:
+                    if accumulated_content:
+                        messages = self._intro_continuation_messages(book, chapter, accumulated_content)
+                    else:
+                        messages = self._intro_messages(book, chapter)
+
+                    try:
+                        # Create streaming response WITHOUT structured output
+                        stream = await self.client.chat.completions.create(
+                            model=CHAPTER_INTRO_MODEL,
+                            messages=messages,
+                            stream=True,
+                            stream_options={"include_usage": True}
+                        )
+
+                        # Process the streaming response
+                        async for chunk in stream:
+                            if chunk.choices and chunk.choices[0].delta.content:
+                                accumulated_content += chunk.choices[0].delta.content
+
+                                for event in self._section_events(accumulated_content, sent_content, sections_data):
+                                    yield event
+
+                                completed_length = self._completed_sections_length(accumulated_content)
+                                if completed_length > checkpointed_length:
+                                    checkpointed_length = completed_length
+                                    self._save_checkpoint(
+                                        CacheService.INTRO_CHECKPOINT, cache_key,
+                                        {"content": accumulated_content[:completed_length]}, CHAPTER_INTRO_VERSION
+                                    )
+
+                            # Capture usage data from the final chunk
+                            if hasattr(chunk, 'usage') and chunk.usage:
+                                self._add_usage(usage_data, chunk.usage)
+                        break
+
+                    except Exception as e:
+                        retries += 1
+                        delay = self._retry_delay(e, retries)
+                        if delay is None:
+                            yield {'type': 'error', 'message': f'API error: {str(e)}'}
+                            return
+                        await asyncio.sleep(delay)
+        except SchedulerError as e:
+            yield {'type': 'error', 'message': f'Server busy: {str(e)}', 'busy': True}
+            return
+
+        final_sections.update(self._parse_streaming_sections(accumulated_content))
+
+    async def _parallel_intro_sections(self, book: str, chapter: int, cache_key: str, priority: str,
+                                       usage_data: Dict[str, int],
+                                       final_sections: Dict[str, str]) -> AsyncGenerator[Dict[str, Any], None]:
+        """Generate each section group concurrently, filling `final_sections`.
+
+        Events of all groups are interleaved as they arrive, and a
+        `section_complete` event marks each finished section. Finished
+        sections are checkpointed; a checkpoint left by the one-call mode
+        supplies the sections it had closed.
+        """
+        checkpoint = self._get_checkpoint(CacheService.INTRO_CHECKPOINT, cache_key, CHAPTER_INTRO_VERSION)
+        if "sections" in checkpoint:
+            final_sections.update(checkpoint["sections"])
+        else:
+            content = checkpoint.get("content", "")
+            final_sections.update(self._parse_streaming_sections(content[:self._completed_sections_length(content)]))
+
+        # Replay sections restored from a checkpoint
+        for section_name, section_content in final_sections.items():
+            if section_name in ("MainHeading", "TimelineInfo"):
+                yield {'type': 'header_update', 'section': section_name, 'content': section_content}
+            else:
+                yield {'type': 'section_update', 'section': section_name, 'is_complete': False, 'content': section_content}
+            yield {'type': 'section_complete', 'section': section_name}
+
+        groups = [group for group in INTRO_SECTION_GROUPS
+                  if any(section_name not in final_sections for section_name in group)]
+        events: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+
+        async def generate(group: List[str]):
+            try:
+                async for event in self._intro_group_stream(book, chapter, cache_key, group, priority, usage_data):
+                    await events.put(event)
+            finally:
+                events.put_nowait(None)
 
-[KEY_INSIGHTS]
-Point out 2-3 meaningful spiritual themes, divine patterns, or biblical truths that emerge in this chapter. Help readers recognize God's hand at work and understand what the Holy Spirit wants them to discover. Create anticipation for spiritual growth and deeper faith.
-[/KEY_INSIGHTS]
+        tasks = [asyncio.create_task(generate(group)) for group in groups]
+        try:
+            running = len(tasks)
+            while running:
+                event = await events.get()
+                if event is None:
+                    running -= 1
+                elif event['type'] == 'group_complete':
+                    final_sections.update(event['data'])
+                    self._save_checkpoint(
+                        CacheService.INTRO_CHECKPOINT, cache_key, {"sections": final_sections}, CHAPTER_INTRO_VERSION
+                    )
+                    for section_name in event['data']:
+                        yield {'type': 'section_complete', 'section': section_name}
+                else:
+                    yield event
+                    if event['type'] == 'error':
+                        return
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @_buffered
+    async def _intro_group_stream(self, book: str, chapter: int, cache_key: str, group: List[str], priority: str,
+                                  usage_data: Dict[str, int]) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream one section group; ends with `group_complete` carrying its sections."""
+        markers = [INTRO_SECTIONS[section_name] for section_name in group]
+        accumulated_content = ""
+        sent_content = {section_name: "" for section_name in group}
+        sections_data = {}
+        retries = 0
 
-[WHY_THIS_MATTERS_TODAY]
-Connect the chapter's divine wisdom to contemporary Christian life. What eternal truths, spiritual lessons, or insights about God's character can speak to believers today? Invite personal reflection on how God's Word applies to their walk with Him.
-[/WHY_THIS_MATTERS_TODAY]
+        try:
+            async with self.scheduler.slot(priority, Config.SCHEDULER_DEADLINES[priority]):
+                while True:
+                    if accumulated_content:
+                        messages = self._intro_continuation_messages(book, chapter, accumulated_content, markers)
+                    else:
+                        messages = self._intro_messages(book, chapter, markers)
+
+                    try:
+                        stream = await self.client.chat.completions.create(
+                            model=CHAPTER_INTRO_MODEL,
+                            messages=messages,
+                            stream=True,
+                            stream_options={"include_usage": True},
+                            # Routes the group's calls to one cache for the shared prompt prefix. The
+                            # provider only caches prefixes of 1024+ tokens and the intro prompt is
+                            # about 750, so for now every group is billed the full prompt.
+                            prompt_cache_key=f"chapter_intro/{cache_key}"
+                        )
+
+                        async for chunk in stream:
+                            if chunk.choices and chunk.choices[0].delta.content:
+                                accumulated_content += chunk.choices[0].delta.content
+                                for event in self._section_events(accumulated_content, sent_content, sections_data):
+                                    yield event
+
+                            # Capture usage data from the final chunk
+                            if hasattr(chunk, 'usage') and chunk.usage:
+                                self._add_usage(usage_data, chunk.usage)
+                        break
+
+                    except Exception as e:
+                        retries += 1
+                        delay = self._retry_delay(e, retries)
+                        if delay is None:
+                            yield {'type': 'error', 'message': f'API error: {str(e)}'}
+                            return
+                        await asyncio.sleep(delay)
+        except SchedulerError as e:
+            yield {'type': 'error', 'message': f'Server busy: {str(e)}', 'busy': True}
+            return
+
+        sections = self._parse_streaming_sections(accumulated_content)
+        yield {'type': 'group_complete',
+               'data': {section_name: sections[section_name] for section_name in group if section_name in sections}}
+
+    def strongs_cache_key(self, book: str, chapter: int, word: str) -> str:
+        """Cache key for a clicked word, resolved to its Strong's number or lemma."""
+        chapter_text = self.verse_store.chapter_text(book, chapter)
+        tags = self.verse_store.strongs_tags(book, chapter)
+        canonical_word = self.lexicon_service.canonical_word(book, word, chapter_text, tags)
+        return self.cache_service.strongs_key(book, chapter, canonical_word)
+
+    def _get_checkpoint(self, kind: str, key: str, version: str) -> Dict[str, Any]:
+        """Return a checkpoint left by the current content version, else empty."""
+        entry = self.cache_service.get_entry(kind, key)
+        if entry is None or entry["version"] != version:
+            return {}
+        return entry["data"]
+
+    def _save_checkpoint(self, kind: str, key: str, data: Dict[str, Any], version: str) -> None:
+        """Write a checkpoint; a failed write only loses resumability, so it is logged rather than raised."""
+        try:
+            self.cache_service.set(kind, key, data, version)
+        except OSError as e:
+            logging.warning(f"Checkpoint {kind} {key} not written: {e}")
 
-Use warm, reverent language that feels like a faithful pastor or Bible teacher sharing God's truth with love. Be scholarly but deeply respectful of Scripture's divine inspiration. Create genuine spiritual curiosity and hunger for God's Word through faithful exposition and biblical insight.
+    def _revalidate(self, kind: str, key: str, request: Dict[str, Any]) -> None:
+        if self.revalidator is not None:
+            self.revalidator.enqueue(kind, key, request)
 
-Chapter: **{book} {chapter}**
-"""
+    def _intro_messages(self, book: str, chapter: int, markers: Optional[List[str]] = None) -> List[Dict[str, str]]:
+        messages = [
+            {
+                "role": "user",
+                "content": CHAPTER_INTRO_PROMPT.format(book=book, chapter=chapter)
             }
         ]
-
-        try:
-            # Create streaming response WITHOUT structured output
-            stream = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                stream=True
-            )
-
-            accumulated_content = ""
-            usage_data = {}
-            current_section = None
-            sections_data = {
-                "MainHeading": "",
-                "TimelineInfo": "",
-                "Paras": []
-            }
-
-            # Track what we've already sent to avoid duplicates
-            sent_content = {
-                "MainHeading": "",
-                "TimelineInfo": "",
-                "CulturalContext": "",
-                "WhatMightSeemStrange": "",
-                "KeyInsights": "",
-                "WhyThisMattersToday": ""
+        if markers:
+            messages.append({
+                "role": "user",
+                "content": INTRO_SECTION_PROMPT.format(markers=", ".join(f"[{marker}]" for marker in markers))
+            })
+        return messages
+
+    def _intro_continuation_messages(self, book: str, chapter: int, partial: str,
+                                     markers: Optional[List[str]] = None) -> List[Dict[str, str]]:
+        """Ask the model to pick up exactly where an interrupted generation stopped."""
+        return self._intro_messages(book, chapter, markers) + [
+            {"role": "assistant", "content": partial},
+            {
+                "role": "user",
+                "content": "Your previous response was cut off. Continue it from exactly where it stopped, "
+                           "without repeating any text already written, and complete every remaining section "
+                           "using the same section markers."
             }
+        ]
 
-            # Process the streaming response
-            for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    content_chunk = chunk.choices[0].delta.content
-                    accumulated_content += content_chunk
-                    
-                    # Parse sections as they come in
-                    parsed_sections = self._parse_streaming_sections(accumulated_content)
-                    
-                    # Check if we have new content to stream
-                    for section_name, content in parsed_sections.items():
-                        if section_name not in ['MainHeading', 'TimelineInfo'] and content:
-                            # This is a paragraph section, stream only the new part
-                            previous_length = len(sent_content.get(section_name, ""))
-                            if len(content) > previous_length:
-                                new_content = content[previous_length:]
-
-                                # Avoid streaming any part of content that still includes section markers
-                                if "[" in new_content or "]" in new_content:
-                                    continue  # Wait for a cleaner version
-
-                                # New content available
-                                sent_content[section_name] = content
-                                
-                                yield f"data: {json.dumps({'type': 'section_update', 'section': section_name, 'content': new_content, 'is_complete': False})}\n\n"
-                        
-                        elif section_name in ['MainHeading', 'TimelineInfo'] and content and content != sent_content.get(section_name, ""):
-                            # Update header sections only if they've changed
-                            sent_content[section_name] = content
-                            sections_data[section_name] = content
-                            yield f"data: {json.dumps({'type': 'header_update', 'section': section_name, 'content': content})}\n\n"
-
-                # Capture usage data from the final chunk
-                if hasattr(chunk, 'usage') and chunk.usage:
-                    usage_data = {
-                        "prompt_tokens": chunk.usage.prompt_tokens,
-                        "completion_tokens": chunk.usage.completion_tokens,
-                        "total_tokens": chunk.usage.total_tokens
-                    }
-
-            # Final processing
-            final_sections = self._parse_streaming_sections(accumulated_content)
-            
-            # Build final structured data
-            sections_data["MainHeading"] = final_sections.get("MainHeading", "")
-            sections_data["TimelineInfo"] = final_sections.get("TimelineInfo", "")
-            sections_data["Paras"] = []
-            
-            for section_name in ["CulturalContext", "WhatMightSeemStrange", "KeyInsights", "WhyThisMattersToday"]:
-                if section_name in final_sections and final_sections[section_name]:
-                    sections_data["Paras"].append({
-                        "title": self._section_name_to_title(section_name),
-                        "content": final_sections[section_name]
-                    })
-
-            # Validate the complete response
+    def _section_events(self, content: str, sent_content: Dict[str, str],
+                        sections_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build the stream events for sections that changed since the last call."""
+        events = []
+        parsed_sections = self._parse_streaming_sections(content)
+
+        for section_name, section_content in parsed_sections.items():
+            if section_name not in ['MainHeading', 'TimelineInfo'] and section_content:
+                # This is a paragraph section, stream only the new part
+                previous_length = len(sent_content.get(section_name, ""))
+                if len(section_content) > previous_length:
+                    new_content = section_content[previous_length:]
+
+                    # Avoid streaming any part of content that still includes section markers
+                    if "[" in new_content or "]" in new_content:
+                        continue  # Wait for a cleaner version
+
+                    # New content available
+                    sent_content[section_name] = section_content
+
+                    events.append({'type': 'section_update', 'section': section_name, 'is_complete': False, 'content': new_content})
+
+            elif section_name in ['MainHeading', 'TimelineInfo'] and section_content and section_content != sent_content.get(section_name, ""):
+                # Update header sections only if they've changed
+                sent_content[section_name] = section_content
+                sections_data[section_name] = section_content
+                events.append({'type': 'header_update', 'section': section_name, 'content': section_content})
+
+        return events
+
+    def _completed_sections_length(self, content: str) -> int:
+        """Return the length of the prefix that ends with the last closed section."""
+        completed_length = 0
+        for marker in INTRO_SECTIONS.values():
+            closing = f"[/{marker}]"
+            position = content.upper().rfind(closing)
+            if position != -1:
+                completed_length = max(completed_length, position + len(closing))
+        return completed_length
+
+    @staticmethod
+    def _retry_delay(error: Exception, retries: int) -> Optional[float]:
+        """Seconds to wait before retry number `retries`, or None to give up.
+
+        Only transient upstream failures are retried: connection errors,
+        streams broken off mid-response, rate limits and 5xx responses.
+        Rejected requests (400, 401, unknown parameters) fail at once. The
+        delay is exponential with full jitter, and a rate limit's
+        Retry-After is honoured up to STREAM_RETRY_BACKOFF_MAX.
+        """
+        # Imported here, like the client: only needed once a call has failed
+        import httpx
+        import openai
+
+        retry_after = None
+        if isinstance(error, openai.APIStatusError):
+            if error.status_code != 429 and error.status_code < 500:
+                return None
             try:
-                validated_intro = ChapterIntro(**sections_data)
-                
-                # Log usage if available
-                if usage_data:
-                    cost_data = self.logging_service.calculate_cost(
-                        usage_data.get("prompt_tokens", 0),
-                        usage_data.get("completion_tokens", 0)
-                    )
-                    self.logging_service.log_token_usage(
-                        "get_chapter_intro_stream", book, chapter, None, usage_data, cost_data
-                    )
-
-                # Send completion signal with validated data
-                yield f"data: {json.dumps({'type': 'complete', 'data': validated_intro.model_dump()})}\n\n"
-                
-            except Exception as e:
-                yield f"data: {json.dumps({'type': 'error', 'message': f'Validation error: {str(e)}'})}\n\n"
-
-        except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': f'API error: {str(e)}'})}\n\n"
+                retry_after = float(error.response.headers.get("retry-after", ""))
+            except ValueError:
+                pass
+        elif isinstance(error, openai.APIConnectionError):
+            pass
+        elif isinstance(error, openai.APIError):
+            # An error event inside the stream; only the server's own failures are transient
+            if getattr(error, "type", None) != "server_error":
+                return None
+        elif not isinstance(error, httpx.TransportError):
+            # A stream broken off mid-response surfaces as httpx's TransportError
+            return None
+
+        if retries > Config.STREAM_MAX_RETRIES:
+            return None
+        backoff = min(Config.STREAM_RETRY_BACKOFF * 2 ** (retries - 1), Config.STREAM_RETRY_BACKOFF_MAX)
+        delay = random.uniform(0, backoff)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, Config.STREAM_RETRY_BACKOFF_MAX))
+        return delay
+
+    @staticmethod
+    def _add_usage(usage_data: Dict[str, int], usage) -> None:
+        """Accumulate token usage across the attempts of one generation."""
+        usage_data["prompt_tokens"] = usage_data.get("prompt_tokens", 0) + usage.prompt_tokens
+        usage_data["completion_tokens"] = usage_data.get("completion_tokens", 0) + usage.completion_tokens
+        usage_data["total_tokens"] = usage_data.get("total_tokens", 0) + usage.total_tokens
 
     def _parse_streaming_sections(self, content: str) -> Dict[str, str]:
         """Parse sections from streaming content using markers."""
@@ -177,8 +508,6 @@ Chapter: **{book} {chapter}**
             "WhyThisMattersToday": r'\[WHY_THIS_MATTERS_TODAY\]\s*(.*?)(?:\s*\[/WHY_THIS_MATTERS_TODAY\]|$)'
         }
         
-        import re
-        
         for section_name, pattern in patterns.items():
             match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
             if match:
@@ -201,154 +530,436 @@ Chapter: **{book} {chapter}**
         }
         return mapping.get(section_name, section_name)
 
-    async def get_strongs_analysis_stream(self, book: str, chapter: int, word: str) -> AsyncGenerator[str, None]:
-        """Stream Strong's analysis with structured output."""
-        
-        messages = [
-            {
-                "role": "user",
-                "content": f"""
-You are a biblical scholar specializing in Strong's Concordance analysis. Analyze the word "{word}" as it appears in {book} {chapter} and provide comprehensive Strong's information structured for a beautiful frontend interface.
+    async def get_strongs_analysis_stream(self, book: str, chapter: int, word: str, refresh: bool = False,
+                                          priority: str = INTERACTIVE, verse: Optional[int] = None,
+                                          tiers: Sequence[str] = STRONGS_TIERS) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream Strong's analysis in two tiers.
+
+        The fast tier, on a small model, streams `original_language_info`
+        and `contextual_meaning` as `content` chunks of one JSON document and
+        ends with a `tier_complete` event. The deep tier writes
+        `general_meanings` and `biblical_usage_examples` with one concurrent
+        call each; their chunks follow as `field_content` events tagged with
+        the field. The deep calls are given `original_language_info` as
+        context, so both tiers describe the same original word: from the
+        cached gloss, else they start as soon as the fast tier closes it. `tiers` selects which
+        tiers to return, and each tier is cached on its own. When the
+        scheduler has too few free slots, the deep tier is deferred to the
+        background and `complete` lists the fields it left out.
+
+        Completed fields are checkpointed as they close. After an upstream
+        failure only the missing fields are requested again; a
+        `content_reset` event carries the JSON prefix the retried chunks
+        continue from, so clients keep one coherent document.
+
+        Stale cached tiers are served while they regenerate in the
+        background, as for chapter intros. Inflected forms that resolve to
+        the same Strong's number share one cached analysis.
+
+        With a `verse`, the verse and its neighbours from the verse store go
+        into the prompt and `contextual_meaning` is cached per verse, so
+        only that part is generated for further verses. `refresh` then
+        bypasses only the per-verse entry.
+        """
+        cache_key = self.strongs_cache_key(book, chapter, word)
+        request = {"book": book, "chapter": chapter, "word": word}
+        canonical_word = cache_key.rsplit("/", 1)[1]
+        strongs_number = canonical_word if STRONGS_NUMBER.match(canonical_word) else None
+        usage_data = {}
+
+        gloss, gloss_current = None, False
+        if not (refresh and verse is None and FAST_TIER in tiers):
+            gloss, gloss_current = self._strongs_tier(CacheService.STRONGS_FAST, cache_key, request)
+        detail, detail_current = None, False
+        if DEEP_TIER in tiers and not refresh:
+            detail, detail_current = self._strongs_tier(CacheService.STRONGS_DEEP, cache_key, request)
+
+        deep_events: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+        deep_task = None
+        generated = False
+        fast_slots = 1 if FAST_TIER in tiers and (gloss is None or verse is not None) else 0
+        deferred = DEEP_TIER in tiers and detail is None and priority != BULK and \
+            self.scheduler.available(priority) < len(STRONGS_DEEP_FIELDS) + fast_slots
+        if deferred:
+            self._revalidate(CacheService.STRONGS_DEEP, cache_key, request)
+        elif DEEP_TIER in tiers and detail is None:
+            context = asyncio.get_running_loop().create_future()
+            if gloss is not None:
+                context.set_result({"original_language_info": gloss["original_language_info"]})
+            elif FAST_TIER not in tiers:
+                # Nothing to wait for; only the lexicon's Strong's number guides the deep tier
+                context.set_result({})
+            deep_task = asyncio.create_task(self._strongs_deep_tier(
+                book, chapter, word, context, priority, strongs_number, usage_data, deep_events
+            ))
+
+        def share_language_info(fields: Dict[str, Any]):
+            if deep_task is not None and not context.done() and "original_language_info" in fields:
+                context.set_result({"original_language_info": fields["original_language_info"]})
 
-**INSTRUCTIONS:**
-- Use clear, simple English that anyone can understand
-- Structure response for optimal frontend display (think cards and visual sections)
-- Focus on the original language richness and biblical depth
-- Make it encouraging and help people love God's Word more
+        try:
+            fast = None
+            if FAST_TIER in tiers:
+                if verse is None and gloss is not None:
+                    fast = gloss
+                else:
+                    fast = {}
+                    async for event in self._strongs_fast_tier(book, chapter, word, cache_key, request, refresh,
+                                                                priority, verse, gloss, strongs_number, usage_data,
+                                                                share_language_info):
+                        if event['type'] == 'tier_complete':
+                            fast = event['data']
+                        else:
+                            yield event
+                    if not fast:
+                        return
+                    if gloss is None:
+                        gloss, gloss_current, generated = fast, True, True
+                yield {'type': 'tier_complete', 'tier': FAST_TIER, 'data': fast}
+
+            if deep_task is not None:
+                while (event := await deep_events.get()) is not None:
+                    yield event
+                detail = deep_task.result()
+                if detail is None:
+                    return
+                detail_current = generated = True
+                self.cache_service.set(CacheService.STRONGS_DEEP, cache_key, detail, STRONGS_DEEP_VERSION, request)
+            if detail is not None:
+                yield {'type': 'tier_complete', 'tier': DEEP_TIER, 'data': detail}
+        finally:
+            if deep_task is not None and not deep_task.done():
+                deep_task.cancel()
+
+        # Log usage if available
+        if usage_data:
+            cost_data = self.logging_service.calculate_cost(
+                usage_data.get("prompt_tokens", 0),
+                usage_data.get("completion_tokens", 0)
+            )
+            self.logging_service.log_token_usage(
+                "get_strongs_analysis_stream", book, chapter, word, usage_data, cost_data
+            )
 
-Return this structured JSON response with the exact schema provided.
+        try:
+            if fast is not None and detail is not None:
+                analysis = StrongsAnalysis(**fast, **detail).model_dump()
+            else:
+                analysis = {**(fast or {}), **(detail or {})}
+            if generated and gloss_current and detail_current:
+                # Both tiers are current, so the assembled analysis is too
+                self.cache_service.set(
+                    CacheService.STRONGS, cache_key, StrongsAnalysis(**gloss, **detail).model_dump(),
+                    STRONGS_VERSION, request
+                )
+        except Exception as e:
+            yield {'type': 'error', 'message': f'Validation error: {str(e)}'}
+            return
+
+        # Send completion signal with validated data
+        if deferred:
+            yield {'type': 'complete', 'data': analysis, 'deferred': STRONGS_DEEP_FIELDS}
+        else:
+            yield {'type': 'complete', 'data': analysis}
+
+    def _strongs_tier(self, kind: str, cache_key: str, request: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Return a cached tier and whether it is current, queueing stale ones.
+
+        Full analyses cached before the split into tiers still supply the
+        fields of either tier until they are regenerated.
+        """
+        fields = STRONGS_FAST_FIELDS if kind == CacheService.STRONGS_FAST else STRONGS_DEEP_FIELDS
+        versions = {CacheService.STRONGS_FAST: STRONGS_FAST_VERSION, CacheService.STRONGS_DEEP: STRONGS_DEEP_VERSION}
+        entry = self.cache_service.get_entry(kind, cache_key)
+        if entry is None:
+            entry = self.cache_service.get_entry(CacheService.STRONGS, cache_key)
+            if entry is None:
+                return None, False
+            kind, entry = CacheService.STRONGS, {**entry, "data": {field: entry["data"][field] for field in fields}}
+            versions[kind] = STRONGS_VERSION
+
+        current = entry["version"] == versions[kind]
+        if not current:
+            self._revalidate(kind, cache_key, request)
+        return entry["data"], current
+
+    async def _strongs_fast_tier(self, book: str, chapter: int, word: str, cache_key: str, request: Dict[str, Any],
+                                 refresh: bool, priority: str, verse: Optional[int], gloss: Optional[Dict[str, Any]],
+                                 strongs_number: Optional[str], usage_data: Dict[str, int],
+                                 on_fields: Optional[Callable[[Dict[str, Any]], None]] = None
+                                 ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Generate or load the fast tier; ends with `tier_complete` on success.
+
+        `on_fields` is called with the tier's fields each time more of them close.
+        """
+        checkpoint_key, version, passage = cache_key, STRONGS_FAST_VERSION, None
+        completed_fields: Dict[str, Any] = {}
+        if verse is not None:
+            checkpoint_key = self.cache_service.strongs_verse_key(cache_key, verse)
+            version = STRONGS_VERSE_VERSION
+            request = {**request, "verse": verse}
+            passage = self.verse_store.window(book, chapter, verse, Config.STRONGS_VERSE_WINDOW)
+            if gloss is not None:
+                cached_context = None if refresh else self.cache_service.get_entry(CacheService.STRONGS_VERSE,
+                                                                                   checkpoint_key)
+                if cached_context is not None:
+                    if cached_context["version"] != STRONGS_VERSE_VERSION:
+                        self._revalidate(CacheService.STRONGS_VERSE, checkpoint_key, request)
+                    yield {'type': 'tier_complete', 'data': {"original_language_info": gloss["original_language_info"],
+                                                             "contextual_meaning": cached_context["data"]}}
+                    return
+                completed_fields = {"original_language_info": gloss["original_language_info"]}
+
+        completed_fields.update(self._get_checkpoint(CacheService.STRONGS_CHECKPOINT, checkpoint_key, version))
+        async for event in self._generate_strongs_fields(
+            book, chapter, word, STRONGS_FAST_FIELDS, STRONGS_FAST_MODEL, completed_fields, completed_fields,
+            priority, usage_data, checkpoint_key, version, verse, passage, strongs_number, on_fields
+        ):
+            yield event
+        if any(field not in completed_fields for field in STRONGS_FAST_FIELDS):
+            return
 
-Word to analyze: "{word}" in {book} {chapter}
+        try:
+            fast = StrongsGloss(**completed_fields).model_dump()
+        except Exception as e:
+            yield {'type': 'error', 'message': f'Validation error: {str(e)}'}
+            return
+        if verse is not None:
+            self.cache_service.set(CacheService.STRONGS_VERSE, checkpoint_key, fast["contextual_meaning"],
+                                   STRONGS_VERSE_VERSION, request)
+        if gloss is None:
+            # A fresh gloss also seeds the shared, verse-independent entry
+            shared_request = {field: value for field, value in request.items() if field != "verse"}
+            self.cache_service.set(CacheService.STRONGS_FAST, cache_key, fast, STRONGS_FAST_VERSION, shared_request)
+        self.cache_service.delete(CacheService.STRONGS_CHECKPOINT, checkpoint_key)
+        yield {'type': 'tier_complete', 'data': fast}
+
+    async def _strongs_deep_tier(self, book: str, chapter: int, word: str, context: "asyncio.Future[Dict[str, Any]]",
+                                 priority: str, strongs_number: Optional[str], usage_data: Dict[str, int],
+                                 events: asyncio.Queue) -> Optional[Dict[str, Any]]:
+        """Generate the deep fields concurrently, one call each, once `context` resolves.
+
+        Their events go to `events`, tagged with the field, followed by None.
+        Returns the validated fields, or None after an error event.
+        """
+        async def generate(field: str) -> Dict[str, Any]:
+            completed_fields: Dict[str, Any] = {}
+            async for event in self._generate_strongs_fields(
+                book, chapter, word, [field], STRONGS_MODEL, completed_fields, context, priority, usage_data,
+                strongs_number=strongs_number
+            ):
+                if event['type'] in ('content', 'content_reset'):
+                    event = {**event, 'type': f"field_{event['type']}", 'field': field}
+                else:
+                    event = {**event, 'tier': DEEP_TIER, 'field': field}
+                await events.put(event)
+            return completed_fields
 
-Focus on creating a clean, structured response that will look beautiful in a modern web interface with clear sections and easy-to-read information.
-"""
-            }
-        ]
+        try:
+            context = await context
+            results = await asyncio.gather(*(generate(field) for field in STRONGS_DEEP_FIELDS))
+            fields = {field: value for result in results for field, value in result.items()}
+            if any(field not in fields for field in STRONGS_DEEP_FIELDS):
+                return None
+            try:
+                return StrongsDetail(**fields).model_dump()
+            except Exception as e:
+                await events.put({'type': 'error', 'message': f'Validation error: {str(e)}', 'tier': DEEP_TIER})
+                return None
+        finally:
+            events.put_nowait(None)
+
+    @_buffered
+    async def _generate_strongs_fields(self, book: str, chapter: int, word: str, fields: List[str], model: str,
+                                       completed_fields: Dict[str, Any], context: Dict[str, Any], priority: str,
+                                       usage_data: Dict[str, int], checkpoint_key: Optional[str] = None,
+                                       version: Optional[str] = None, verse: Optional[int] = None,
+                                       passage: Optional[Dict[int, str]] = None,
+                                       strongs_number: Optional[str] = None,
+                                       on_fields: Optional[Callable[[Dict[str, Any]], None]] = None
+                                       ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream one structured-output generation of `fields` into `completed_fields`.
+
+        Fields already in `completed_fields` are not requested again, and
+        `context` is shown to the model as the part already written. The
+        fields are all present in `completed_fields` unless an error event
+        was yielded. `on_fields` is called with the fields closed so far
+        whenever more of them close.
+        """
+        # The verse text is known locally, so the model need not write it out
+        verse_text = passage.get(verse) if passage else None
+        retries = 0
+        if on_fields and completed_fields:
+            on_fields(completed_fields)
 
         try:
-            # Create streaming response
-            stream = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=messages,
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "strongs_analysis",
-                        "strict": True,
-                        "schema": {
-                            "type": "object",
-                            "properties": {
-                                "original_language_info": {
-                                    "type": "object",
-                                    "properties": {
-                                        "strongs_number": {"type": "string"},
-                                        "original_language": {"type": "string"},
-                                        "original_script": {"type": "string"},
-                                        "transliteration": {"type": "string"},
-                                        "pronunciation": {"type": "string"},
-                                        "pronunciation_guide": {"type": "string"}
-                                    },
-                                    "required": ["strongs_number", "original_language", "original_script", "transliteration", "pronunciation", "pronunciation_guide"],
-                                    "additionalProperties": False
-                                },
-                                "general_meanings": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "meaning": {"type": "string"},
-                                            "explanation": {"type": "string"},
-                                            "usage_context": {"type": "string"}
-                                        },
-                                        "required": ["meaning", "explanation", "usage_context"],
-                                        "additionalProperties": False
-                                    },
-                                    "minItems": 4,
-                                    "maxItems": 6
-                                },
-                                "contextual_meaning": {
-                                    "type": "object",
-                                    "properties": {
-                                        "verse_reference": {"type": "string"},
-                                        "verse_text": {"type": "string"},
-                                        "word_in_context": {"type": "string"},
-                                        "contextual_explanation": {"type": "string"},
-                                        "why_this_translation": {"type": "string"},
-                                        "deeper_insight": {"type": "string"}
-                                    },
-                                    "required": ["verse_reference", "verse_text", "word_in_context", "contextual_explanation", "why_this_translation", "deeper_insight"],
-                                    "additionalProperties": False
-                                },
-                                "biblical_usage_examples": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "verse_reference": {"type": "string"},
-                                            "verse_text": {"type": "string"},
-                                            "translated_as": {"type": "string"},
-                                            "meaning_used": {"type": "string"},
-                                            "significance": {"type": "string"}
-                                        },
-                                        "required": ["verse_reference", "verse_text", "translated_as", "meaning_used", "significance"],
-                                        "additionalProperties": False
-                                    },
-                                    "minItems": 7,
-                                    "maxItems": 7
+            async with self.scheduler.slot(priority, Config.SCHEDULER_DEADLINES[priority]):
+                while True:
+                    missing_fields = [field for field in fields if field not in completed_fields]
+                    if not missing_fields:
+                        break
+
+                    resumed = bool(completed_fields) or retries > 0
+                    if resumed:
+                        yield {'type': 'content_reset', 'data': self._json_fields_prefix(completed_fields)}
+
+                    attempt_fields = {}
+                    try:
+                        # Create streaming response
+                        stream = await self.client.chat.completions.create(
+                            model=model,
+                            messages=self._strongs_messages(book, chapter, word, {**context, **completed_fields},
+                                                            verse, passage, strongs_number),
+                            response_format={
+                                "type": "json_schema",
+                                "json_schema": {
+                                    "name": "strongs_analysis",
+                                    "strict": True,
+                                    "schema": self._strongs_schema(missing_fields, omit_verse_text=bool(verse_text))
                                 }
                             },
-                            "required": ["original_language_info", "general_meanings", "contextual_meaning", "biblical_usage_examples"],
-                            "additionalProperties": False
-                        }
-                    }
-                },
-                stream=True
-            )
-
-            accumulated_content = ""
-            usage_data = {}
-
-            # Process the streaming response correctly
-            for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    content_chunk = chunk.choices[0].delta.content
-                    accumulated_content += content_chunk
-                    
-                    # Yield the chunk for real-time streaming
-                    yield f"data: {json.dumps({'type': 'content', 'data': content_chunk})}\n\n"
-
-                # Capture usage data from the final chunk
-                if hasattr(chunk, 'usage') and chunk.usage:
-                    usage_data = {
-                        "prompt_tokens": chunk.usage.prompt_tokens,
-                        "completion_tokens": chunk.usage.completion_tokens,
-                        "total_tokens": chunk.usage.total_tokens
-                    }
-
-            # Parse and validate the complete response
-            try:
-                parsed_content = json.loads(accumulated_content)
-                validated_analysis = StrongsAnalysis(**parsed_content)
-                
-                # Log usage if available
-                if usage_data:
-                    cost_data = self.logging_service.calculate_cost(
-                        usage_data.get("prompt_tokens", 0),
-                        usage_data.get("completion_tokens", 0)
-                    )
-                    self.logging_service.log_token_usage(
-                        "get_strongs_analysis_stream", book, chapter, word, usage_data, cost_data
-                    )
-
-                # Send completion signal with validated data
-                yield f"data: {json.dumps({'type': 'complete', 'data': validated_analysis.model_dump()})}\n\n"
-                
-            except json.JSONDecodeError as e:
-                yield f"data: {json.dumps({'type': 'error', 'message': f'JSON parsing error: {str(e)}'})}\n\n"
-            except Exception as e:
-                yield f"data: {json.dumps({'type': 'error', 'message': f'Validation error: {str(e)}'})}\n\n"
+                            stream=True,
+                            stream_options={"include_usage": True}
+                        )
+
+                        accumulated_content = ""
+                        skip_opening_brace = resumed
+
+                        # Process the streaming response correctly
+                        async for chunk in stream:
+                            if chunk.choices and chunk.choices[0].delta.content:
+                                content_chunk = chunk.choices[0].delta.content
+                                accumulated_content += content_chunk
+
+                                if skip_opening_brace:
+                                    # The reset prefix already opened the object
+                                    content_chunk = content_chunk.lstrip()
+                                    if content_chunk.startswith("{"):
+                                        content_chunk = content_chunk[1:]
+                                        skip_opening_brace = False
+
+                                # Yield the chunk for real-time streaming
+                                if content_chunk:
+                                    yield {'type': 'content', 'data': content_chunk}
+
+                                if (checkpoint_key or on_fields) and ("}" in content_chunk or "]" in content_chunk):
+                                    new_fields = self._completed_json_fields(accumulated_content)
+                                    if len(new_fields) > len(attempt_fields):
+                                        attempt_fields = new_fields
+                                        if checkpoint_key:
+                                            self._save_checkpoint(
+                                                CacheService.STRONGS_CHECKPOINT, checkpoint_key,
+                                                {**completed_fields, **attempt_fields}, version
+                                            )
+                                        if on_fields:
+                                            on_fields({**completed_fields, **attempt_fields})
+
+                            # Capture usage data from the final chunk
+                            if hasattr(chunk, 'usage') and chunk.usage:
+                                self._add_usage(usage_data, chunk.usage)
+
+                        try:
+                            completed_fields.update(json.loads(accumulated_content))
+                        except json.JSONDecodeError as e:
+                            yield {'type': 'error', 'message': f'JSON parsing error: {str(e)}'}
+                            return
+                        if on_fields:
+                            on_fields(completed_fields)
+                        break
+
+                    except Exception as e:
+                        completed_fields.update(attempt_fields)
+                        retries += 1
+                        delay = self._retry_delay(e, retries)
+                        if delay is None:
+                            yield {'type': 'error', 'message': f'API error: {str(e)}'}
+                            return
+                        await asyncio.sleep(delay)
+        except SchedulerError as e:
+            yield {'type': 'error', 'message': f'Server busy: {str(e)}', 'busy': True}
+            return
+
+        if verse_text and "contextual_meaning" in completed_fields:
+            completed_fields["contextual_meaning"] = {"verse_text": verse_text, **completed_fields["contextual_meaning"]}
+
+    def _strongs_messages(self, book: str, chapter: int, word: str, completed_fields: Dict[str, Any],
+                          verse: Optional[int] = None, passage: Optional[Dict[int, str]] = None,
+                          strongs_number: Optional[str] = None) -> List[Dict[str, str]]:
+        content = STRONGS_PROMPT.format(book=book, chapter=chapter, word=word)
+        if strongs_number:
+            content += STRONGS_NUMBER_HINT.format(strongs_number=strongs_number)
+        if verse is not None:
+            lines = [f"{'>' if number == verse else ' '}{number} {text}" for number, text in sorted((passage or {}).items())]
+            content += STRONGS_VERSE_PROMPT.format(verse=verse, passage="\n".join(lines) or "(text unavailable)")
+        messages = [
+            {
+                "role": "user",
+                "content": content
+            }
+        ]
+        if completed_fields:
+            messages.append({
+                "role": "user",
+                "content": "Part of this analysis has already been written:\n"
+                           f"{json.dumps(completed_fields, ensure_ascii=False)}\n\n"
+                           "Return ONLY the remaining fields required by the schema, consistent with the part above."
+            })
+        return messages
+
+    @staticmethod
+    def _strongs_schema(fields: List[str], omit_verse_text: bool = False) -> Dict[str, Any]:
+        """Restrict the Strong's schema to the given top-level fields.
+
+        `omit_verse_text` drops `contextual_meaning.verse_text`, for verses
+        whose text is filled in from the verse store.
+        """
+        if len(fields) == len(STRONGS_ANALYSIS_SCHEMA["required"]) and not omit_verse_text:
+            return STRONGS_ANALYSIS_SCHEMA
+        properties = {field: STRONGS_ANALYSIS_SCHEMA["properties"][field] for field in fields}
+        if omit_verse_text and "contextual_meaning" in properties:
+            contextual = properties["contextual_meaning"]
+            properties["contextual_meaning"] = {
+                **contextual,
+                "properties": {name: value for name, value in contextual["properties"].items() if name != "verse_text"},
+                "required": [name for name in contextual["required"] if name != "verse_text"]
+            }
+        return {
+            **STRONGS_ANALYSIS_SCHEMA,
+            "properties": properties,
+            "required": fields
+        }
 
-        except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': f'API error: {str(e)}'})}\n\n"
+    @staticmethod
+    def _completed_json_fields(content: str) -> Dict[str, Any]:
+        """Return the top-level fields already closed in a partial JSON object."""
+        decoder = json.JSONDecoder()
+        fields = {}
+        whitespace = re.compile(r'\s*')
 
+        position = whitespace.match(content, 0).end()
+        if not content.startswith("{", position):
+            return fields
+        position += 1
 
+        try:
+            while True:
+                position = whitespace.match(content, position).end()
+                key, position = decoder.raw_decode(content, position)
+                position = whitespace.match(content, position).end()
+                if not content.startswith(":", position):
+                    return fields
+                position = whitespace.match(content, position + 1).end()
+                value, position = decoder.raw_decode(content, position)
+                fields[key] = value
+                position = whitespace.match(content, position).end()
+                if not content.startswith(",", position):
+                    return fields
+                position += 1
+        except (json.JSONDecodeError, IndexError):
+            return fields
+
+    @staticmethod
+    def _json_fields_prefix(fields: Dict[str, Any]) -> str:
+        """Render completed fields as an open JSON object ready for the rest."""
+        body = json.dumps(fields, ensure_ascii=False)
+        return body[:-1] + ", " if fields else "{"
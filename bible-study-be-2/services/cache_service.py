@@ -0,0 +1,268 @@
+import json
+import os
+import struct
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import quote, unquote
+from config import Config
+from models.schemas import ChapterIntro, ContextualMeaning, StrongsAnalysis, StrongsDetail, StrongsGloss
+from services import codec
+
+# Binary entries start with a length-prefixed JSON header holding version and request
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+class CacheService:
+    """On-disk store for generated chapter intros and Strong's analyses.
+
+    Kinds with a model in MODELS are stored in the compact binary codec
+    (`.bin`), deflated on disk. A bounded in-memory LRU keeps their
+    inflated bytes, so a hit costs a stat and a trusted decode without
+    zlib. Other kinds, such as checkpoints, are stored as JSON.
+    """
+
+    CHAPTER_INTRO = "chapter_intro"
+    STRONGS = "strongs"
+    # The two tiers of an analysis: the quick gloss and the deep meanings and examples
+    STRONGS_FAST = "strongs_fast"
+    STRONGS_DEEP = "strongs_deep"
+    # The contextual_meaning of a word in one verse; the rest is shared in STRONGS
+    STRONGS_VERSE = "strongs_verse"
+    INTRO_CHECKPOINT = "chapter_intro_checkpoint"
+    STRONGS_CHECKPOINT = "strongs_checkpoint"
+
+    MODELS = {
+        CHAPTER_INTRO: ChapterIntro,
+        STRONGS: StrongsAnalysis,
+        STRONGS_VERSE: ContextualMeaning,
+        STRONGS_FAST: StrongsGloss,
+        STRONGS_DEEP: StrongsDetail,
+    }
+
+    def __init__(self, cache_dir: str = Config.CACHE_DIR,
+                 memory_entries: int = Config.CACHE_MEMORY_ENTRIES):
+        self.cache_dir = cache_dir
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        self._dictionaries: Dict[int, Optional[bytes]] = {}
+        self._current_dictionary: Optional[bytes] = None
+        self._current_dictionary_loaded = False
+
+    @staticmethod
+    def intro_key(book: str, chapter: int) -> str:
+        return f"{book.upper()}/{chapter}"
+
+    @staticmethod
+    def strongs_key(book: str, chapter: int, word: str) -> str:
+        return f"{book.upper()}/{chapter}/{word.strip()}"
+
+    @staticmethod
+    def strongs_verse_key(strongs_key: str, verse: int) -> str:
+        return f"{strongs_key}/{verse}"
+
+    def _path(self, kind: str, key: str, extension: str = ".json") -> str:
+        parts = [quote(part, safe="") for part in key.split("/")]
+        return os.path.join(self.cache_dir, kind, *parts) + extension
+
+    def get(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for a key, or None on a miss."""
+        entry = self.get_entry(kind, key)
+        return entry["data"] if entry is not None else None
+
+    def get_entry(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry: `version`, `request` and the `data` payload.
+
+        Entries written before versioning are returned with version None.
+        """
+        if kind in self.MODELS:
+            blob = self._read_blob(self._path(kind, key, ".bin"))
+            if blob is not None:
+                try:
+                    return self._decode_entry(self.MODELS[kind], blob)
+                except codec.CodecError:
+                    return None
+        return self._read_json_entry(kind, key)
+
+    def get_header(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return an entry's `version` and `request` without decoding its payload.
+
+        Reads the file directly, bypassing the memory LRU, so scans over the
+        whole cache neither pay for decoding nor evict hot entries.
+        """
+        if kind in self.MODELS:
+            try:
+                with open(self._path(kind, key, ".bin"), "rb") as f:
+                    (header_length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+                    header = json.loads(f.read(header_length))
+                return {"version": header["version"], "request": header["request"]}
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError, TypeError, struct.error):
+                return None
+
+        entry = self._read_json_entry(kind, key)
+        return None if entry is None else {"version": entry["version"], "request": entry["request"]}
+
+    def set(self, kind: str, key: str, data: Dict[str, Any], version: Optional[str] = None,
+            request: Optional[Dict[str, Any]] = None) -> None:
+        """Atomically write an entry so readers never see a partial file.
+
+        `version` is the content version that produced the payload and
+        `request` the arguments needed to regenerate it.
+        """
+        if kind in self.MODELS:
+            path = self._path(kind, key, ".bin")
+            blob = self._encode_entry(self.MODELS[kind], data, version, request)
+            self._memory.pop(path, None)
+            self._write_file(path, blob)
+            return
+
+        entry = {"version": version, "request": request, "data": data}
+        self._write_file(self._path(kind, key), json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+    def delete(self, kind: str, key: str) -> None:
+        for path in (self._path(kind, key), self._path(kind, key, ".bin")):
+            self._memory.pop(path, None)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def entries(self, kind: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (key, entry) for every cached entry of a kind."""
+        for key in self.keys(kind):
+            entry = self.get_entry(kind, key)
+            if entry is not None:
+                yield key, entry
+
+    def headers(self, kind: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (key, header) for every cached entry of a kind; see get_header."""
+        for key in self.keys(kind):
+            header = self.get_header(kind, key)
+            if header is not None:
+                yield key, header
+
+    def keys(self, kind: str) -> Iterator[str]:
+        """Yield the key of every cached entry of a kind."""
+        root = os.path.join(self.cache_dir, kind)
+        for dirpath, _, filenames in os.walk(root):
+            names = sorted({os.path.splitext(filename)[0] for filename in filenames
+                            if filename.endswith((".json", ".bin"))})
+            for name in names:
+                rel = os.path.relpath(os.path.join(dirpath, name), root)
+                yield "/".join(unquote(part) for part in rel.split(os.sep))
+
+    def install_dictionary(self, dictionary: bytes) -> int:
+        """Store a trained compression dictionary and use it for new writes."""
+        dict_id = codec.dictionary_id(dictionary)
+        directory = os.path.join(self.cache_dir, "dictionaries")
+        self._write_file(os.path.join(directory, f"{dict_id:08x}.zdict"), dictionary)
+        self._write_file(os.path.join(directory, "current"), f"{dict_id:08x}".encode("ascii"))
+        self._dictionaries[dict_id] = dictionary
+        self._current_dictionary = dictionary
+        self._current_dictionary_loaded = True
+        return dict_id
+
+    def _encode_entry(self, model_cls, data: Dict[str, Any], version: Optional[str],
+                      request: Optional[Dict[str, Any]]) -> bytes:
+        header = json.dumps({"version": version, "request": request}, ensure_ascii=False).encode("utf-8")
+        return _HEADER_LENGTH.pack(len(header)) + header + codec.encode(model_cls, data, self._dictionary())
+
+    def _decode_entry(self, model_cls, blob: bytes) -> Dict[str, Any]:
+        position = _HEADER_LENGTH.size
+        try:
+            (header_length,) = _HEADER_LENGTH.unpack_from(blob)
+            entry = json.loads(blob[position:position + header_length])
+        except (ValueError, struct.error) as e:
+            raise codec.CodecError(f"Corrupt cache entry header: {e!r}")
+        if not isinstance(entry, dict):
+            raise codec.CodecError("Corrupt cache entry header")
+        payload = blob[position + header_length:]
+        dictionary = self._dictionary(codec.blob_dictionary_id(payload))
+        # Entries were validated before they were written, so skip validation
+        entry["data"] = codec.decode(model_cls, payload, dictionary)
+        return entry
+
+    def _inflate_entry(self, blob: bytes) -> bytes:
+        """Decompress an entry's payload once, so memory hits skip zlib."""
+        if len(blob) < _HEADER_LENGTH.size:
+            return blob
+        (header_length,) = _HEADER_LENGTH.unpack_from(blob)
+        split = _HEADER_LENGTH.size + header_length
+        payload = blob[split:]
+        try:
+            return blob[:split] + codec.inflate(payload, self._dictionary(codec.blob_dictionary_id(payload)))
+        except codec.CodecError:
+            # Left as stored; decoding reports the error
+            return blob
+
+    def _read_json_entry(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(kind, key), "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if "data" in stored and "version" in stored:
+            return stored
+        return {"version": None, "request": None, "data": stored}
+
+    def _read_blob(self, path: str) -> Optional[bytes]:
+        """Read an entry through the in-memory LRU of inflated blobs, revalidated by mtime."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._memory.pop(path, None)
+            return None
+
+        cached = self._memory.get(path)
+        if cached is not None and cached[0] == mtime:
+            self._memory.move_to_end(path)
+            return cached[1]
+
+        try:
+            with open(path, "rb") as f:
+                blob = self._inflate_entry(f.read())
+        except OSError:
+            return None
+        if self.memory_entries > 0:
+            self._memory[path] = (mtime, blob)
+            self._memory.move_to_end(path)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+        return blob
+
+    def _dictionary(self, dict_id: Optional[int] = None) -> Optional[bytes]:
+        """Return a dictionary by id, or the current one when no id is given."""
+        directory = os.path.join(self.cache_dir, "dictionaries")
+        if dict_id is None:
+            if not self._current_dictionary_loaded:
+                try:
+                    with open(os.path.join(directory, "current"), "r", encoding="ascii") as f:
+                        self._current_dictionary = self._dictionary(int(f.read().strip(), 16))
+                except (OSError, ValueError):
+                    self._current_dictionary = None
+                self._current_dictionary_loaded = True
+            return self._current_dictionary
+
+        if dict_id == 0:
+            return None
+        if dict_id not in self._dictionaries:
+            try:
+                with open(os.path.join(directory, f"{dict_id:08x}.zdict"), "rb") as f:
+                    self._dictionaries[dict_id] = f.read()
+            except OSError:
+                self._dictionaries[dict_id] = None
+        return self._dictionaries[dict_id]
+
+    @staticmethod
+    def _write_file(path: str, content: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,255 @@
+"""Compact binary encoding for cached ChapterIntro and StrongsAnalysis payloads.
+
+Layout: MAGIC, a flags byte, a 4-byte dictionary id, then the body,
+deflated when FLAG_COMPRESSED is set. The body is two integer arrays,
+each a width byte, a varint count and fixed-width little-endian
+integers, followed by UTF-8 text. The first array holds the length in
+characters of every string in the string table, whose strings are
+concatenated in the text. The second is the slot array: walking the
+model's fields in declaration order, every string field is one slot
+holding its string-table index, and every list is one slot holding its
+length. Field names are never stored, and a repeated string (book names,
+languages, verse references) is stored once.
+"""
+import sys
+import zlib
+from array import array
+from functools import lru_cache
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Tuple, Type, get_args, get_origin
+from pydantic import BaseModel
+
+MAGIC = b"BSC1"
+FLAG_COMPRESSED = 1
+HEADER_SIZE = len(MAGIC) + 1 + 4
+ZLIB_MAX_DICTIONARY = 32 * 1024
+
+STRING, MODEL, LIST = 0, 1, 2
+
+
+class CodecError(ValueError):
+    """Raised for blobs that are corrupt or need an unavailable dictionary."""
+
+
+@lru_cache(maxsize=None)
+def _plan(model_cls: Type[BaseModel]) -> Tuple:
+    """Compile a model into (field name, kind, sub-plan) triples."""
+    return tuple((name, *_field_plan(field.annotation)) for name, field in model_cls.model_fields.items())
+
+
+def _field_plan(annotation) -> Tuple[int, Any]:
+    if annotation is str:
+        return STRING, None
+    if get_origin(annotation) in (list, List):
+        return LIST, _field_plan(get_args(annotation)[0])
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return MODEL, _plan(annotation)
+    raise TypeError(f"unsupported field type for the cache codec: {annotation!r}")
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: memoryview, position: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _write_array(out: bytearray, values: List[int]):
+    values = array("H" if max(values, default=0) < 0x10000 else "I", values)
+    if sys.byteorder == "big":
+        values.byteswap()
+    out.append(values.itemsize)
+    _write_varint(out, len(values))
+    out += values.tobytes()
+
+
+def _read_array(data: memoryview, position: int) -> Tuple[array, int]:
+    itemsize = data[position]
+    if itemsize not in (2, 4):
+        raise ValueError(f"bad array width {itemsize}")
+    count, position = _read_varint(data, position + 1)
+    end = position + count * itemsize
+    if end > len(data):
+        raise ValueError("truncated array")
+    values = array("H" if itemsize == 2 else "I")
+    values.frombytes(data[position:end])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values, end
+
+
+def dictionary_id(dictionary: bytes) -> int:
+    return zlib.adler32(dictionary)
+
+
+def encode(model_cls: Type[BaseModel], data: Dict[str, Any], dictionary: Optional[bytes] = None,
+           compress: bool = True) -> bytes:
+    """Encode a payload already valid for `model_cls`."""
+    strings: Dict[str, int] = {}
+    slots: List[int] = []
+
+    def walk(plan, value):
+        for name, kind, sub_plan in plan:
+            write(kind, sub_plan, value[name])
+
+    def write(kind, sub_plan, value):
+        if kind == STRING:
+            index = strings.get(value)
+            if index is None:
+                index = strings[value] = len(strings)
+            slots.append(index)
+        elif kind == MODEL:
+            walk(sub_plan, value)
+        else:
+            slots.append(len(value))
+            item_kind, item_plan = sub_plan
+            for item in value:
+                write(item_kind, item_plan, item)
+
+    walk(_plan(model_cls), data)
+
+    body = bytearray()
+    _write_array(body, [len(string) for string in strings])
+    _write_array(body, slots)
+    body += "".join(strings).encode("utf-8")
+
+    flags, dict_id = 0, 0
+    if compress:
+        compressor = zlib.compressobj(6, zdict=dictionary) if dictionary else zlib.compressobj(6)
+        compressed = compressor.compress(bytes(body)) + compressor.flush()
+        if len(compressed) < len(body):
+            body = compressed
+            flags = FLAG_COMPRESSED
+            dict_id = dictionary_id(dictionary) if dictionary else 0
+    return MAGIC + bytes([flags]) + dict_id.to_bytes(4, "little") + bytes(body)
+
+
+def blob_dictionary_id(blob: bytes) -> int:
+    """Id of the dictionary a blob was compressed with, 0 for none."""
+    return int.from_bytes(blob[len(MAGIC) + 1:HEADER_SIZE], "little")
+
+
+def _body(blob: bytes, dictionary: Optional[bytes]) -> memoryview:
+    if not blob.startswith(MAGIC):
+        raise CodecError("not a cache codec blob")
+    body = memoryview(blob)[HEADER_SIZE:]
+    if not blob[len(MAGIC)] & FLAG_COMPRESSED:
+        return body
+    dict_id = blob_dictionary_id(blob)
+    if dict_id and (dictionary is None or dictionary_id(dictionary) != dict_id):
+        raise CodecError(f"blob needs dictionary {dict_id:08x}")
+    try:
+        decompressor = zlib.decompressobj(zdict=dictionary) if dict_id else zlib.decompressobj()
+        return memoryview(decompressor.decompress(body))
+    except zlib.error as e:
+        raise CodecError(str(e))
+
+
+def inflate(blob: bytes, dictionary: Optional[bytes] = None) -> bytes:
+    """Return the uncompressed form of a blob, which decodes without zlib."""
+    if blob.startswith(MAGIC) and not blob[len(MAGIC)] & FLAG_COMPRESSED:
+        return blob
+    return MAGIC + bytes([0]) + bytes(4) + bytes(_body(blob, dictionary))
+
+
+def decode(model_cls: Type[BaseModel], blob: bytes, dictionary: Optional[bytes] = None) -> Dict[str, Any]:
+    """Trusted fast path: rebuild the payload dict without any validation.
+
+    Only use it on blobs this service encoded from validated models.
+    """
+    body = _body(blob, dictionary)
+    try:
+        lengths, position = _read_array(body, 0)
+        slots, position = _read_array(body, position)
+        text = str(body[position:], "utf-8")
+        ends = list(accumulate(lengths))
+        table = list(map(text.__getitem__, map(slice, [0, *ends], ends)))
+        return _reader(model_cls)(table, iter(slots).__next__)
+    except (IndexError, ValueError, StopIteration) as e:
+        raise CodecError(f"corrupt blob: {e!r}")
+
+
+@lru_cache(maxsize=None)
+def _reader(model_cls: Type[BaseModel]):
+    """Compile a model's plan into a function rebuilding its payload dict.
+
+    The function body is one nested dict/list expression, generated the way
+    dataclasses generates __init__, so decoding makes no per-field calls
+    beyond fetching the next slot.
+    """
+    source = f"def read(table, next_slot):\n    return {_reader_source(MODEL, _plan(model_cls))}\n"
+    namespace: Dict[str, Any] = {}
+    exec(source, namespace)
+    return namespace["read"]
+
+
+def _reader_source(kind, sub_plan) -> str:
+    if kind == STRING:
+        return "table[next_slot()]"
+    if kind == LIST:
+        return f"[{_reader_source(*sub_plan)} for _ in range(next_slot())]"
+    fields = ", ".join(f"{name!r}: {_reader_source(field_kind, field_plan)}"
+                       for name, field_kind, field_plan in sub_plan)
+    return "{" + fields + "}"
+
+
+def decode_model(model_cls: Type[BaseModel], blob: bytes, dictionary: Optional[bytes] = None) -> BaseModel:
+    """Decode and validate, for blobs that did not come from this service."""
+    return model_cls.model_validate(decode(model_cls, blob, dictionary))
+
+
+def train_dictionary(samples: List[Tuple[Type[BaseModel], Dict[str, Any]]],
+                     size: int = ZLIB_MAX_DICTIONARY) -> bytes:
+    """Build a zlib preset dictionary from representative payloads.
+
+    Strings repeated across payloads (whole values, then frequent words) are
+    packed with the most valuable last, where deflate reaches them cheapest.
+    """
+    string_counts: Dict[str, int] = {}
+    word_counts: Dict[str, int] = {}
+    for model_cls, data in samples:
+        seen = set()
+        _collect_strings(_plan(model_cls), data, seen)
+        for string in seen:
+            string_counts[string] = string_counts.get(string, 0) + 1
+            for word in string.split():
+                word_counts[word] = word_counts.get(word, 0) + 1
+
+    repeated = [(count * len(string), string) for string, count in string_counts.items() if count > 1]
+    words = [(count * len(word), word + " ") for word, count in word_counts.items() if count > 1 and len(word) > 3]
+    pieces = [piece for _, piece in sorted(words + repeated, reverse=True)]
+
+    dictionary, total = [], 0
+    for piece in pieces:
+        encoded = piece.encode("utf-8")
+        if total + len(encoded) > size:
+            continue
+        dictionary.append(encoded)
+        total += len(encoded)
+    return b"".join(reversed(dictionary))
+
+
+def _collect_strings(plan, value, seen: set):
+    for name, kind, sub_plan in plan:
+        _collect_value(kind, sub_plan, value[name], seen)
+
+
+def _collect_value(kind, sub_plan, value, seen: set):
+    if kind == STRING:
+        seen.add(value)
+    elif kind == MODEL:
+        _collect_strings(sub_plan, value, seen)
+    else:
+        for item in value:
+            _collect_value(sub_plan[0], sub_plan[1], item, seen)
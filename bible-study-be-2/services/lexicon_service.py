@@ -0,0 +1,178 @@
+import json
+import re
+from typing import Dict, List, Optional, Set, Tuple, Union
+from config import Config
+
+NEW_TESTAMENT_BOOKS = {
+    "MAT", "MRK", "LUK", "JHN", "ACT", "ROM", "1CO", "2CO", "GAL", "EPH", "PHP", "COL", "1TH", "2TH",
+    "1TI", "2TI", "TIT", "PHM", "HEB", "JAS", "1PE", "2PE", "1JN", "2JN", "3JN", "JUD", "REV"
+}
+
+# (suffix, replacement) pairs tried in order when reducing an inflected form. Only
+# inflections that keep the part of speech: plurals and third-person forms, plus
+# the archaic verb endings in VERB_SUFFIX_RULES. Derivations such as "-ness" are
+# left whole.
+SUFFIX_RULES = [("ies", "y"), ("es", ""), ("s", "")]
+# Applied when the lemma is a verb and nothing else ("believeth", "savest")
+VERB_SUFFIX_RULES = [("eth", ""), ("eth", "e"), ("est", ""), ("est", "e")]
+# "-ed"/"-ing" forms also serve as adjectives and nouns, so they would assign a
+# number that may be wrong. They, and the verb endings, only reduce to a lemma that
+# decides no number in the testament anyway, so they merely share its lemma key.
+UNDECIDED_SUFFIX_RULES = [("ied", "y"), ("ed", ""), ("ed", "e"), ("ing", ""), ("ing", "e")]
+
+POSSESSIVE = re.compile(r"(?:['’]s|s['’])$")
+WORD_TOKEN = re.compile(r"[A-Za-z]+(?:['’][A-Za-z]+)?")
+
+
+class LexiconService:
+    """Offline lemmatizer and English gloss to Strong's number lookup.
+
+    The table in LEXICON_FILE has three parts: `entries` maps lemmas to a
+    Strong's number per testament, `case_sensitive` does the same for
+    forms whose printed case matters (LORD vs Lord), and `irregular_forms`
+    maps inflections the suffix rules cannot reduce. A testament holding
+    a list means the gloss renders several original words there, so it
+    never decides a number on its own. An entry with `"pos": "verb"` is
+    only ever a verb, which lets archaic verb endings reduce to it.
+    Forms that differ only in a leading capital share a lemma; other
+    case-sensitive forms, such as LORD, keep their own entry and key.
+
+    Strong's tags aligned to the chapter's text take precedence over the
+    table: a word is resolved through them when every tagged occurrence
+    in the chapter carries the same number.
+    """
+
+    def __init__(self, lexicon_file: str = Config.LEXICON_FILE):
+        try:
+            with open(lexicon_file, "r", encoding="utf-8") as f:
+                table = json.load(f)
+        except (OSError, ValueError):
+            table = {}
+        self.entries: Dict[str, Dict[str, Union[str, List[str]]]] = table.get("entries", {})
+        self.case_sensitive: Dict[str, Dict[str, Union[str, List[str]]]] = table.get("case_sensitive", {})
+        self.irregular_forms: Dict[str, str] = table.get("irregular_forms", {})
+
+    @staticmethod
+    def testament(book: str) -> str:
+        return "NT" if book.upper() in NEW_TESTAMENT_BOOKS else "OT"
+
+    @staticmethod
+    def surface_form(word: str) -> str:
+        """Strip surrounding punctuation and a possessive ending."""
+        word = word.strip().strip(".,;:!?\"()[]“”‘")
+        return POSSESSIVE.sub("", word)
+
+    def lemmatize(self, word: str, testament: Optional[str] = None) -> str:
+        """Reduce an English form to its lemma.
+
+        Suffix rules only apply when they land on a lemma the table knows,
+        so unknown words are left whole rather than over-stemmed. With a
+        `testament`, UNDECIDED_SUFFIX_RULES also reduce to lemmas that
+        decide no number there.
+        """
+        lowered = self.surface_form(word).lower()
+        if lowered in self.entries:
+            return lowered
+        if lowered in self.irregular_forms:
+            return self.irregular_forms[lowered]
+        for candidate in self._suffix_candidates(lowered, testament):
+            if candidate in self.entries:
+                return candidate
+        return lowered
+
+    def _suffix_candidates(self, word: str, testament: Optional[str]) -> List[str]:
+        candidates = []
+        for suffix, replacement in SUFFIX_RULES:
+            candidates.extend(self._strip(word, suffix, replacement))
+        for suffix, replacement in VERB_SUFFIX_RULES:
+            candidates.extend(candidate for candidate in self._strip(word, suffix, replacement)
+                              if self.entries.get(candidate, {}).get("pos") == "verb"
+                              or self._undecided(candidate, testament))
+        for suffix, replacement in UNDECIDED_SUFFIX_RULES:
+            candidates.extend(candidate for candidate in self._strip(word, suffix, replacement)
+                              if self._undecided(candidate, testament))
+        return candidates
+
+    def _undecided(self, lemma: str, testament: Optional[str]) -> bool:
+        """Whether a known lemma assigns no single number in the testament."""
+        return testament is not None and lemma in self.entries and \
+            not isinstance(self.entries[lemma].get(testament), str)
+
+    def _case_form(self, form: str) -> Optional[str]:
+        """The case-sensitive entry a form belongs to: an exact match, else its capitalised form."""
+        if form in self.case_sensitive:
+            return form
+        if form.lower() == form or form.capitalize() == form:
+            capitalised = form.capitalize()
+            if capitalised in self.case_sensitive:
+                return capitalised
+        return None
+
+    def _case_key(self, token: str) -> str:
+        """Comparison key of a token: case is kept only for forms like LORD that are not just capitalised."""
+        case_form = self._case_form(token)
+        return token if case_form == token and token != token.capitalize() else token.lower()
+
+    @staticmethod
+    def _strip(word: str, suffix: str, replacement: str) -> List[str]:
+        if not word.endswith(suffix) or len(word) - len(suffix) < 2:
+            return []
+        stem = word[:-len(suffix)]
+        candidates = [stem + replacement]
+        # Undo consonant doubling: "begetteth" -> "begett" -> "beget"
+        if not replacement and len(stem) > 2 and stem[-1] == stem[-2]:
+            candidates.append(stem[:-1])
+        return candidates
+
+    def strongs_number(self, book: str, word: str, chapter_text: str = "",
+                       tags: Optional[Dict[int, List[Tuple[str, str]]]] = None) -> Optional[str]:
+        """Map a clicked word to a Strong's number, or None when unknown or ambiguous.
+
+        `tags` are the chapter's aligned (English, Strong's number) pairs by
+        verse. When the chapter text is available, the word's printed form
+        in the chapter decides case-sensitive entries, e.g. "LORD" (YHWH)
+        versus "Lord" (Adonai) even if the click arrived lowercased.
+        """
+        form = self._printed_form(self.surface_form(word), chapter_text)
+        if tags:
+            aligned = self._aligned_numbers(form, tags)
+            if aligned:
+                return aligned.pop() if len(aligned) == 1 else None
+
+        testament = self.testament(book)
+        case_form = self._case_form(form)
+        if case_form is not None:
+            number = self.case_sensitive[case_form].get(testament)
+        else:
+            number = self.entries.get(self.lemmatize(form, testament), {}).get(testament)
+        return number if isinstance(number, str) else None
+
+    def _aligned_numbers(self, form: str, tags: Dict[int, List[Tuple[str, str]]]) -> Set[str]:
+        """Numbers tagged on the form anywhere in the chapter, keeping LORD apart from lord."""
+        key = self._case_key(form)
+        return {number for pairs in tags.values() for english, number in pairs
+                if key in map(self._case_key, WORD_TOKEN.findall(english))}
+
+    @staticmethod
+    def _printed_form(form: str, chapter_text: str) -> str:
+        if not chapter_text:
+            return form
+        printed = {token for token in WORD_TOKEN.findall(chapter_text)
+                   if LexiconService.surface_form(token).lower() == form.lower()}
+        if form in printed or not printed:
+            return form
+        return LexiconService.surface_form(sorted(printed)[0])
+
+    def canonical_word(self, book: str, word: str, chapter_text: str = "",
+                       tags: Optional[Dict[int, List[Tuple[str, str]]]] = None) -> str:
+        """Cache-key form of a clicked word: its Strong's number, else its lemma.
+
+        A form like "LORD" without a single number keeps its printed case,
+        so it never shares an entry with "Lord" or "lord".
+        """
+        number = self.strongs_number(book, word, chapter_text, tags)
+        if number:
+            return number
+        form = self._printed_form(self.surface_form(word), chapter_text)
+        key = self._case_key(form)
+        return key if key == form and key != key.lower() else self.lemmatize(form, self.testament(book))
@@ -4,15 +4,21 @@ from datetime import datetime
 from config import Config
 from models.schemas import LogEntry, TokenUsage, CostData
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(Config.LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+
+def configure_logging():
+    """Install the file and console handlers; called on application startup."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(Config.LOG_FILE),
+            logging.StreamHandler()
+        ]
+    )
+
+def shutdown_logging():
+    """Flush and close all handlers; called on application shutdown."""
+    logging.shutdown()
 
 class LoggingService:
     @staticmethod
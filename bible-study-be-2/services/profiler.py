@@ -0,0 +1,251 @@
+import asyncio
+import contextvars
+import hmac
+import itertools
+import logging
+import os
+import signal
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from config import Config
+
+# Innermost matching module decides the stage a sample is attributed to
+STAGE_MODULES = (
+    ("re", "regex"),
+    ("json", "json"),
+    ("pydantic", "pydantic"),
+    ("pydantic_core", "pydantic"),
+    ("openai", "openai_sdk"),
+    ("httpx", "http_client"),
+    ("httpcore", "http_client"),
+    ("services.sse", "sse_encoding"),
+    ("services.codec", "cache_codec"),
+    ("services.cache_service", "cache"),
+    ("services.bible_service", "generation"),
+    ("starlette", "framework"),
+    ("fastapi", "framework"),
+    ("uvicorn", "server"),
+    ("asyncio", "event_loop"),
+)
+
+
+class ProfilerUnavailable(RuntimeError):
+    """Sampling needs SIGPROF and an event loop on the main thread."""
+
+
+class _Recording:
+    """Collapsed stacks and their sample counts for one profile."""
+
+    def __init__(self, name: str, max_stacks: int):
+        self.name = name
+        self.max_stacks = max_stacks
+        self.started = time.time()
+        self.samples = 0
+        self.stacks: Counter = Counter()
+
+    def add(self, stack: str):
+        self.samples += 1
+        if stack in self.stacks or len(self.stacks) < self.max_stacks:
+            self.stacks[stack] += 1
+        else:
+            self.stacks["[truncated]"] += 1
+
+
+# The request the event loop is running, set for every request by ProfilerMiddleware
+_current_request: contextvars.ContextVar[Optional[Tuple[Dict[str, Any], Optional[_Recording]]]] = \
+    contextvars.ContextVar("profiled_request", default=None)
+
+
+class SamplingProfiler:
+    """Opt-in CPU sampling profiler for the API process.
+
+    A SIGPROF interval timer interrupts the process every
+    PROFILE_INTERVAL_MS of CPU time. The handler runs on the event loop
+    thread inside the task that was executing, so each sample is tagged
+    with that request's route and with a stage taken from the innermost
+    recognised module on the stack (regex, json, pydantic, the OpenAI SDK
+    and so on). C extensions are charged to their Python caller.
+
+    The timer only runs while a profiled request is in flight or a
+    global window is open, and samples are folded into bounded counters,
+    so profiling costs nothing when off. Profiles are written as
+    collapsed stacks ("frame;frame;frame count") to PROFILE_DIR, ready
+    for flamegraph.pl or speedscope.
+    """
+
+    def __init__(self, profile_dir: str = Config.PROFILE_DIR, interval_ms: float = Config.PROFILE_INTERVAL_MS,
+                 max_depth: int = Config.PROFILE_MAX_DEPTH, max_stacks: int = Config.PROFILE_MAX_STACKS):
+        self.profile_dir = profile_dir
+        self.interval = interval_ms / 1000
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+        self._window: Optional[_Recording] = None
+        self._window_ends = 0.0
+        self._window_timer: Optional[asyncio.TimerHandle] = None
+        self._requests: List[_Recording] = []
+        self._installed = False
+        self._armed = False
+        self._stage_cache: Dict[str, str] = {}
+        # Keeps file names unique when profiles start in the same second
+        self._sequence = itertools.count(1)
+        # Most recent profile paths, for status
+        self.written: Deque[str] = deque(maxlen=10)
+
+    @property
+    def available(self) -> bool:
+        return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "available": self.available,
+            "window": None if self._window is None else {
+                "seconds_left": round(max(0.0, self._window_ends - time.monotonic()), 1),
+                "samples": self._window.samples,
+            },
+            "profiled_requests": len(self._requests),
+            "interval_ms": self.interval * 1000,
+            "recent_profiles": list(self.written),
+        }
+
+    def start_window(self, seconds: float) -> float:
+        """Profile every request for `seconds`, capped at PROFILE_MAX_WINDOW; returns the length used."""
+        seconds = min(max(seconds, 0.1), Config.PROFILE_MAX_WINDOW)
+        if self._window is None:
+            self._arm()
+            self._window = _Recording("window", self.max_stacks)
+        else:
+            self._window_timer.cancel()
+        self._window_ends = time.monotonic() + seconds
+        self._window_timer = asyncio.get_running_loop().call_later(seconds, self.stop_window)
+        return seconds
+
+    def stop_window(self) -> Optional[str]:
+        """Close the global window early or on schedule; returns the profile path."""
+        if self._window is None:
+            return None
+        recording, self._window = self._window, None
+        self._window_timer.cancel()
+        self._disarm()
+        return self._write(recording)
+
+    def begin_request(self, scope: Dict[str, Any]) -> Optional[_Recording]:
+        """Start a per-request profile, or None when it is unavailable or at the limit."""
+        if not self.available or len(self._requests) >= Config.PROFILE_MAX_REQUESTS:
+            return None
+        self._arm()
+        recording = _Recording(f"request-{scope.get('path', '')}", self.max_stacks)
+        self._requests.append(recording)
+        return recording
+
+    def end_request(self, recording: _Recording) -> Optional[str]:
+        self._requests.remove(recording)
+        self._disarm()
+        return self._write(recording)
+
+    def _arm(self):
+        if not self.available:
+            raise ProfilerUnavailable("sampling needs SIGPROF and an event loop on the main thread")
+        if not self._installed:
+            signal.signal(signal.SIGPROF, self._sample)
+            self._installed = True
+        if not self._armed:
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+            self._armed = True
+
+    def _disarm(self):
+        if self._armed and self._window is None and not self._requests:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            self._armed = False
+
+    def _sample(self, signum, frame):
+        current = _current_request.get()
+        recording = current[1] if current is not None else None
+        if self._window is None and recording is None:
+            return
+
+        if current is None:
+            route = "[no request]"
+        else:
+            scope = current[0]
+            route_object = scope.get("route")
+            route = getattr(route_object, "path", None) or scope.get("path", "[unknown]")
+
+        frames = []
+        stage = None
+        while frame is not None and len(frames) < self.max_depth:
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", "?")
+            if stage is None:
+                stage = self._stage(module)
+            frames.append(f"{module}:{code.co_name}" if frames else f"{module}:{code.co_name}:{frame.f_lineno}")
+            frame = frame.f_back
+        frames.append(f"stage:{stage or 'other'}")
+        frames.append(route.replace(";", ":"))
+        stack = ";".join(reversed(frames))
+
+        if self._window is not None:
+            self._window.add(stack)
+        if recording is not None:
+            recording.add(stack)
+
+    def _stage(self, module: str) -> Optional[str]:
+        stage = self._stage_cache.get(module)
+        if stage is None:
+            stage = ""
+            for prefix, name in STAGE_MODULES:
+                if module == prefix or module.startswith(prefix + "."):
+                    stage = name
+                    break
+            self._stage_cache[module] = stage
+        return stage or None
+
+    def _write(self, recording: _Recording) -> Optional[str]:
+        if not recording.stacks:
+            return None
+        os.makedirs(self.profile_dir, exist_ok=True)
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in recording.name)[:80]
+        started = time.strftime('%Y%m%d-%H%M%S', time.localtime(recording.started))
+        path = os.path.join(self.profile_dir,
+                            f"{started}-{os.getpid()}-{next(self._sequence)}-{safe_name}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in recording.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self.written.append(path)
+        return path
+
+
+class ProfilerMiddleware:
+    """Tag every request for the profiler and profile those that ask for it.
+
+    A request is profiled when its PROFILE_HEADER matches PROFILE_TOKEN;
+    with no token configured, per-request profiling is off. The profile
+    covers the whole response, streamed body included, and its path is
+    logged when the request ends.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profiler: Optional[SamplingProfiler] = getattr(scope["app"].state, "profiler", None)
+        recording = None
+        if profiler is not None and Config.PROFILE_TOKEN:
+            header = Config.PROFILE_HEADER.lower().encode("latin-1")
+            if hmac.compare_digest(dict(scope["headers"]).get(header, b""), Config.PROFILE_TOKEN.encode("latin-1")):
+                recording = profiler.begin_request(scope)
+
+        token = _current_request.set((scope, recording))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_request.reset(token)
+            if recording is not None:
+                path = profiler.end_request(recording)
+                if path:
+                    logging.info(f"Profile of {scope.get('path')} written to {path}")
@@ -0,0 +1,223 @@
+import hashlib
+import json
+from typing import Dict
+
+CHAPTER_INTRO_MODEL = "gpt-4o-mini"
+STRONGS_MODEL = "gpt-4o"
+# Writes the quick gloss: original language info and the contextual meaning
+STRONGS_FAST_MODEL = "gpt-4o-mini"
+
+# Strong's analyses are generated in two tiers, each cached on its own
+STRONGS_FAST_FIELDS = ["original_language_info", "contextual_meaning"]
+STRONGS_DEEP_FIELDS = ["general_meanings", "biblical_usage_examples"]
+
+CHAPTER_INTRO_PROMPT = """
+You are a faithful biblical scholar and devoted guide helping someone understand the sacred richness of **{book} {chapter}**. Your goal is to provide reverent cultural context and spiritual insights that make God's Word more meaningful and accessible, especially addressing any difficult or challenging passages that modern readers might struggle with, inviting deeper exploration of His truth even in hard-to-understand verses.
+
+Create a warm, faith-affirming introduction that says "Here's what will help God's Word come alive for you in this chapter."
+
+Please structure your response EXACTLY as follows, with clear section markers:
+
+[MAIN_HEADING]
+A thoughtful, engaging title (6–10 words) that captures the chapter's essence and addresses any challenging content. If the chapter contains difficult passages, craft a heading that acknowledges the complexity while remaining faith-affirming. Think: "Understanding God's Heart in Hard Passages" or "Ancient Laws, Eternal Love" - informative but pastorally sensitive.
+[/MAIN_HEADING]
+
+[TIMELINE_INFO]
+The historical period (e.g., "c. 1000–960 BCE") with brief context if helpful.
+[/TIMELINE_INFO]
+
+[CULTURAL_CONTEXT]
+Explain the historical and cultural backdrop that God was working within. What customs, beliefs, or social structures help us understand how the Lord was moving among His people? Help readers see God's providence through the lens of ancient times while honoring the divine inspiration of Scripture.
+[/CULTURAL_CONTEXT]
+
+[WHAT_MIGHT_SEEM_STRANGE]
+Acknowledge elements that modern readers might find unfamiliar or difficult to understand, while affirming that God's Word is perfect and timeless. Pay special attention to passages that may seem challenging to contemporary readers (like laws about slavery, violence, or ancient customs). Gently explain how these difficult passages reveal God's character, His progressive revelation, and His work within the cultural context of the time, helping readers understand the deeper spiritual truths without compromising biblical authority.
+[/WHAT_MIGHT_SEEM_STRANGE]
+
+[KEY_INSIGHTS]
+Point out 2-3 meaningful spiritual themes, divine patterns, or biblical truths that emerge in this chapter. Help readers recognize God's hand at work and understand what the Holy Spirit wants them to discover. Create anticipation for spiritual growth and deeper faith.
+[/KEY_INSIGHTS]
+
+[WHY_THIS_MATTERS_TODAY]
+Connect the chapter's divine wisdom to contemporary Christian life. What eternal truths, spiritual lessons, or insights about God's character can speak to believers today? Invite personal reflection on how God's Word applies to their walk with Him.
+[/WHY_THIS_MATTERS_TODAY]
+
+Use warm, reverent language that feels like a faithful pastor or Bible teacher sharing God's truth with love. Be scholarly but deeply respectful of Scripture's divine inspiration. Create genuine spiritual curiosity and hunger for God's Word through faithful exposition and biblical insight.
+
+Chapter: **{book} {chapter}**
+"""
+
+STRONGS_PROMPT = """
+You are a biblical scholar specializing in Strong's Concordance analysis. Analyze the word "{word}" as it appears in {book} {chapter} and provide comprehensive Strong's information structured for a beautiful frontend interface.
+
+**INSTRUCTIONS:**
+- Use clear, simple English that anyone can understand
+- Structure response for optimal frontend display (think cards and visual sections)
+- Focus on the original language richness and biblical depth
+- Make it encouraging and help people love God's Word more
+
+Return this structured JSON response with the exact schema provided.
+
+Word to analyze: "{word}" in {book} {chapter}
+
+Focus on creating a clean, structured response that will look beautiful in a modern web interface with clear sections and easy-to-read information.
+"""
+
+# Appended to STRONGS_PROMPT when the reader clicked a word in a known verse
+STRONGS_VERSE_PROMPT = """
+The word was clicked in verse {verse}. The passage, with that verse marked by ">":
+{passage}
+
+Base `contextual_meaning` on verse {verse} as written above.
+"""
+
+# Sections generated together in parallel intro mode; the heading and timeline are short, so they share a call
+INTRO_SECTION_GROUPS = [
+    ["MainHeading", "TimelineInfo"],
+    ["CulturalContext"],
+    ["WhatMightSeemStrange"],
+    ["KeyInsights"],
+    ["WhyThisMattersToday"],
+]
+
+# Follows the full intro prompt in parallel mode, so every section call shares that prompt as its prefix.
+# The prefix is under the 1024-token prompt-cache minimum, so each call pays for it in full.
+INTRO_SECTION_PROMPT = """
+Write ONLY the {markers} section(s) of this introduction, with the same section markers, and nothing else.
+"""
+
+# Appended when the lexicon already resolved the word, so concurrent tiers agree on it
+STRONGS_NUMBER_HINT = """
+The lexicon identifies this word as Strong's {strongs_number}.
+"""
+
+INTRO_SECTIONS = {
+    "MainHeading": "MAIN_HEADING",
+    "TimelineInfo": "TIMELINE_INFO",
+    "CulturalContext": "CULTURAL_CONTEXT",
+    "WhatMightSeemStrange": "WHAT_MIGHT_SEEM_STRANGE",
+    "KeyInsights": "KEY_INSIGHTS",
+    "WhyThisMattersToday": "WHY_THIS_MATTERS_TODAY"
+}
+
+STRONGS_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "original_language_info": {
+            "type": "object",
+            "properties": {
+                "strongs_number": {"type": "string"},
+                "original_language": {"type": "string"},
+                "original_script": {"type": "string"},
+                "transliteration": {"type": "string"},
+                "pronunciation": {"type": "string"},
+                "pronunciation_guide": {"type": "string"}
+            },
+            "required": ["strongs_number", "original_language", "original_script", "transliteration", "pronunciation", "pronunciation_guide"],
+            "additionalProperties": False
+        },
+        "general_meanings": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "meaning": {"type": "string"},
+                    "explanation": {"type": "string"},
+                    "usage_context": {"type": "string"}
+                },
+                "required": ["meaning", "explanation", "usage_context"],
+                "additionalProperties": False
+            },
+            "minItems": 4,
+            "maxItems": 6
+        },
+        "contextual_meaning": {
+            "type": "object",
+            "properties": {
+                "verse_reference": {"type": "string"},
+                "verse_text": {"type": "string"},
+                "word_in_context": {"type": "string"},
+                "contextual_explanation": {"type": "string"},
+                "why_this_translation": {"type": "string"},
+                "deeper_insight": {"type": "string"}
+            },
+            "required": ["verse_reference", "verse_text", "word_in_context", "contextual_explanation", "why_this_translation", "deeper_insight"],
+            "additionalProperties": False
+        },
+        "biblical_usage_examples": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "verse_reference": {"type": "string"},
+                    "verse_text": {"type": "string"},
+                    "translated_as": {"type": "string"},
+                    "meaning_used": {"type": "string"},
+                    "significance": {"type": "string"}
+                },
+                "required": ["verse_reference", "verse_text", "translated_as", "meaning_used", "significance"],
+                "additionalProperties": False
+            },
+            "minItems": 7,
+            "maxItems": 7
+        }
+    },
+    "required": ["original_language_info", "general_meanings", "contextual_meaning", "biblical_usage_examples"],
+    "additionalProperties": False
+}
+
+
+def _version_hash(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def _strongs_tier_version(fields, model: str, *prompts: str) -> str:
+    schema = {field: STRONGS_ANALYSIS_SCHEMA["properties"][field] for field in fields}
+    return _version_hash(STRONGS_PROMPT, STRONGS_NUMBER_HINT, *prompts, json.dumps(schema, sort_keys=True), model)
+
+
+def content_versions() -> Dict[str, Dict[str, str]]:
+    """Version of each generated content type.
+
+    The version hashes everything that shapes an output: prompt template,
+    response schema and model. Any edit to them produces a new version, and
+    cached entries recorded under an older one become stale.
+    """
+    return {
+        "chapter_intro": {
+            "model": CHAPTER_INTRO_MODEL,
+            # Both intro modes share one cache entry, so the parallel mode's prompt and grouping count too
+            "version": _version_hash(CHAPTER_INTRO_PROMPT, json.dumps(INTRO_SECTIONS, sort_keys=True),
+                                     INTRO_SECTION_PROMPT, json.dumps(INTRO_SECTION_GROUPS), CHAPTER_INTRO_MODEL),
+        },
+        "strongs_fast": {
+            "model": STRONGS_FAST_MODEL,
+            "version": _strongs_tier_version(STRONGS_FAST_FIELDS, STRONGS_FAST_MODEL),
+        },
+        "strongs_verse": {
+            "model": STRONGS_FAST_MODEL,
+            "version": _strongs_tier_version(["contextual_meaning"], STRONGS_FAST_MODEL, STRONGS_VERSE_PROMPT),
+        },
+        "strongs_deep": {
+            "model": STRONGS_MODEL,
+            "version": _strongs_tier_version(STRONGS_DEEP_FIELDS, STRONGS_MODEL),
+        },
+        # A full analysis is the two tiers assembled
+        "strongs": {
+            "model": STRONGS_MODEL,
+            "version": _version_hash(_strongs_tier_version(STRONGS_FAST_FIELDS, STRONGS_FAST_MODEL),
+                                     _strongs_tier_version(STRONGS_DEEP_FIELDS, STRONGS_MODEL)),
+        },
+    }
+
+
+CONTENT_VERSIONS = content_versions()
+CHAPTER_INTRO_VERSION = CONTENT_VERSIONS["chapter_intro"]["version"]
+STRONGS_VERSION = CONTENT_VERSIONS["strongs"]["version"]
+STRONGS_VERSE_VERSION = CONTENT_VERSIONS["strongs_verse"]["version"]
+STRONGS_FAST_VERSION = CONTENT_VERSIONS["strongs_fast"]["version"]
+STRONGS_DEEP_VERSION = CONTENT_VERSIONS["strongs_deep"]["version"]
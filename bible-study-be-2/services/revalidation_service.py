@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Set, Tuple
+from config import Config
+from services.bible_service import DEEP_TIER, FAST_TIER, STRONGS_TIERS
+from services.cache_service import CacheService
+from services.prompts import (
+    CHAPTER_INTRO_VERSION, STRONGS_DEEP_VERSION, STRONGS_FAST_VERSION, STRONGS_VERSE_VERSION, STRONGS_VERSION
+)
+from services.scheduler_service import BULK
+
+CURRENT_VERSIONS = {
+    CacheService.CHAPTER_INTRO: CHAPTER_INTRO_VERSION,
+    CacheService.STRONGS: STRONGS_VERSION,
+    CacheService.STRONGS_VERSE: STRONGS_VERSE_VERSION,
+    CacheService.STRONGS_FAST: STRONGS_FAST_VERSION,
+    CacheService.STRONGS_DEEP: STRONGS_DEEP_VERSION,
+}
+
+# The Strong's tiers each cache kind is regenerated from
+STRONGS_KIND_TIERS = {
+    CacheService.STRONGS: STRONGS_TIERS,
+    CacheService.STRONGS_VERSE: (FAST_TIER,),
+    CacheService.STRONGS_FAST: (FAST_TIER,),
+    CacheService.STRONGS_DEEP: (DEEP_TIER,),
+}
+
+
+class Revalidator:
+    """Regenerates stale cache entries in the background.
+
+    Entries are regenerated one at a time, and at most
+    REVALIDATE_PER_MINUTE per minute, as bulk work on the model scheduler;
+    entries preempted by interactive load go back to the end of the queue.
+    Readers keep getting the stale version until the new one replaces it.
+    """
+
+    def __init__(self, bible_service, per_minute: float = Config.REVALIDATE_PER_MINUTE):
+        self.bible_service = bible_service
+        self.interval = 60 / per_minute if per_minute > 0 else 0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._pending: Set[Tuple[str, str]] = set()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, kind: str, key: str, request: Dict[str, Any]) -> bool:
+        """Queue an entry for regeneration; returns False if it is already queued."""
+        if (kind, key) in self._pending:
+            return False
+        self._pending.add((kind, key))
+        self._queue.put_nowait((kind, key, request))
+        return True
+
+    async def enqueue_stale(self) -> int:
+        """Queue every cached entry whose content version is out of date.
+
+        The scan reads only entry headers, on a worker thread, so the event
+        loop keeps serving and the cache's memory LRU is left alone.
+        """
+        stale = await asyncio.to_thread(self._stale_entries)
+        return sum(self.enqueue(kind, key, request) for kind, key, request in stale)
+
+    def _stale_entries(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        cache = self.bible_service.cache_service
+        return [(kind, key, header["request"])
+                for kind, version in CURRENT_VERSIONS.items()
+                for key, header in cache.headers(kind)
+                if header["version"] != version and header["request"]]
+
+    async def _run(self):
+        while True:
+            kind, key, request = await self._queue.get()
+            requeue = False
+            try:
+                requeue = not await self._regenerate(kind, request)
+            except Exception as e:
+                logging.error(f"Revalidation of {kind} {key} failed: {e}")
+            if requeue:
+                self._queue.put_nowait((kind, key, request))
+            else:
+                self._pending.discard((kind, key))
+            await asyncio.sleep(self.interval)
+
+    async def _regenerate(self, kind: str, request: Dict[str, Any]) -> bool:
+        """Regenerate one entry; returns False if the scheduler turned it away."""
+        if kind == CacheService.CHAPTER_INTRO:
+            events = self.bible_service.get_chapter_intro_stream(
+                request["book"], request["chapter"], refresh=True, priority=BULK
+            )
+        else:
+            events = self.bible_service.get_strongs_analysis_stream(
+                request["book"], request["chapter"], request["word"], refresh=True, priority=BULK,
+                verse=request.get("verse"), tiers=STRONGS_KIND_TIERS[kind]
+            )
+        async for event in events:
+            if event["type"] == "error":
+                if event.get("busy"):
+                    return False
+                raise RuntimeError(event["message"])
+        return True
@@ -0,0 +1,178 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional, Tuple
+from config import Config
+
+INTERACTIVE = "interactive"  # a reader is waiting on an open modal
+PREFETCH = "prefetch"        # likely to be needed soon
+BULK = "bulk"                # canon warm-up and regeneration
+
+PRIORITIES = (INTERACTIVE, PREFETCH, BULK)
+
+
+class SchedulerError(Exception):
+    """Base class for requests the scheduler could not admit."""
+
+class SchedulerTimeout(SchedulerError):
+    """The request's queueing deadline passed before a slot was free."""
+
+class SchedulerPreempted(SchedulerError):
+    """Queued background work was dropped to make room for interactive load."""
+
+
+class _ClassStats:
+    def __init__(self):
+        self.running = 0
+        self.admitted = 0
+        self.expired = 0
+        self.preempted = 0
+        self.waits: Deque[float] = deque(maxlen=512)
+
+    def snapshot(self, queued: int) -> Dict[str, Any]:
+        waits = sorted(self.waits)
+
+        def percentile(fraction: float) -> float:
+            return round(waits[min(int(len(waits) * fraction), len(waits) - 1)] * 1000, 1) if waits else 0.0
+
+        return {
+            "queued": queued,
+            "running": self.running,
+            "admitted": self.admitted,
+            "expired": self.expired,
+            "preempted": self.preempted,
+            "wait_ms_p50": percentile(0.5),
+            "wait_ms_p95": percentile(0.95),
+        }
+
+
+class ModelScheduler:
+    """Shares a fixed budget of concurrent upstream model calls between classes.
+
+    Free slots go to the waiting class with the lowest virtual time; each
+    admission advances that clock by 1 / weight, so under contention the
+    classes get slots in proportion to their weights. Background classes
+    can never take the last `interactive_reserve` slots, and once
+    `preempt_depth` interactive requests are queued, queued bulk work is
+    failed with SchedulerPreempted so its owner can retry later.
+    """
+
+    def __init__(self, concurrency: int = Config.MODEL_CONCURRENCY,
+                 weights: Optional[Dict[str, float]] = None,
+                 interactive_reserve: int = Config.SCHEDULER_INTERACTIVE_RESERVE,
+                 preempt_depth: int = Config.SCHEDULER_PREEMPT_DEPTH):
+        self.concurrency = concurrency
+        self.weights = weights or {
+            INTERACTIVE: Config.SCHEDULER_WEIGHT_INTERACTIVE,
+            PREFETCH: Config.SCHEDULER_WEIGHT_PREFETCH,
+            BULK: Config.SCHEDULER_WEIGHT_BULK,
+        }
+        self.interactive_reserve = min(interactive_reserve, concurrency - 1)
+        self.preempt_depth = preempt_depth
+        self._queues: Dict[str, Deque[Tuple[asyncio.Future, float]]] = {priority: deque() for priority in PRIORITIES}
+        self._stats = {priority: _ClassStats() for priority in PRIORITIES}
+        self._virtual_time = {priority: 0.0 for priority in PRIORITIES}
+        self._virtual_clock = 0.0
+        self._running = 0
+
+    @asynccontextmanager
+    async def slot(self, priority: str = INTERACTIVE, deadline: Optional[float] = None):
+        """Hold one upstream slot for the duration of the block.
+
+        `deadline` is the longest time in seconds to wait in the queue.
+        """
+        await self._acquire(priority, deadline)
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def available(self, priority: str = INTERACTIVE) -> int:
+        """Slots a request of this class could take right now without queueing."""
+        limit = self.concurrency if priority == INTERACTIVE else self.concurrency - self.interactive_reserve
+        queued = sum(len(queue) for queue in self._queues.values())
+        return max(0, limit - self._running - queued)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "running": self._running,
+            "classes": {priority: self._stats[priority].snapshot(len(self._queues[priority]))
+                        for priority in PRIORITIES},
+        }
+
+    async def _acquire(self, priority: str, deadline: Optional[float]):
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (waiter, time.monotonic())
+        queue = self._queues[priority]
+        if not queue and not self._stats[priority].running:
+            # A class returning from idle does not get credit for its idle time
+            self._virtual_time[priority] = max(self._virtual_time[priority], self._virtual_clock)
+        queue.append(entry)
+
+        self._dispatch()
+        if priority == INTERACTIVE and len(queue) >= self.preempt_depth:
+            self._preempt(BULK)
+
+        try:
+            done, _ = await asyncio.wait({waiter}, timeout=deadline)
+        except asyncio.CancelledError:
+            self._abandon(priority, entry)
+            raise
+        if not done:
+            self._abandon(priority, entry)
+            self._stats[priority].expired += 1
+            raise SchedulerTimeout(f"no {priority} model slot free within {deadline:g}s")
+        waiter.result()
+
+    def _abandon(self, priority: str, entry: Tuple[asyncio.Future, float]):
+        waiter = entry[0]
+        if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+            # Admitted just as the caller gave up
+            self._release(priority)
+            return
+        try:
+            self._queues[priority].remove(entry)
+        except ValueError:
+            pass
+        waiter.cancel()
+
+    def _release(self, priority: str):
+        self._running -= 1
+        self._stats[priority].running -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._running < self.concurrency:
+            priority = self._next_class()
+            if priority is None:
+                return
+            waiter, enqueued_at = self._queues[priority].popleft()
+            if waiter.done():
+                continue
+
+            stats = self._stats[priority]
+            self._running += 1
+            stats.running += 1
+            stats.admitted += 1
+            stats.waits.append(time.monotonic() - enqueued_at)
+            self._virtual_clock = self._virtual_time[priority]
+            self._virtual_time[priority] += 1 / self.weights[priority]
+            waiter.set_result(None)
+
+    def _next_class(self) -> Optional[str]:
+        background_allowed = self._running < self.concurrency - self.interactive_reserve
+        candidates = [priority for priority in PRIORITIES
+                      if self._queues[priority] and (priority == INTERACTIVE or background_allowed)]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda priority: self._virtual_time[priority])
+
+    def _preempt(self, priority: str):
+        queue = self._queues[priority]
+        while queue:
+            waiter, _ = queue.popleft()
+            if not waiter.done():
+                waiter.set_exception(SchedulerPreempted(f"queued {priority} work preempted by interactive load"))
+                self._stats[priority].preempted += 1
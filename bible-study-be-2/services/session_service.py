@@ -0,0 +1,228 @@
+import asyncio
+import heapq
+import itertools
+import time
+import uuid
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+from config import Config
+from models.schemas import SessionJobRequest
+from services.bible_service import FAST_TIER, STRONGS_TIERS, BibleService
+
+
+class SessionError(Exception):
+    """Base class for session requests that cannot be admitted."""
+
+class SessionBusy(SessionError):
+    """The session already has a subscriber."""
+
+class SessionLimitReached(SessionError):
+    """Too many live sessions, or too many jobs in one session."""
+
+
+class SessionJob:
+    def __init__(self, job_id: str, request: SessionJobRequest):
+        self.job_id = job_id
+        self.request = request
+        self.task: Optional[asyncio.Task] = None
+        self.cancelled = False
+        self.cancel_reason = "requested"
+
+
+class ReaderSession:
+    """One reader's multiplexed event stream and the jobs feeding it.
+
+    Jobs wait in a priority queue (higher `priority` first, then submission
+    order) and at most `max_concurrent_jobs` run at once, only while the
+    session's one subscriber is reading the stream. Every event a job
+    produces is tagged with its `job_id` and interleaved on `events`. A
+    session holds at most SESSION_MAX_JOBS queued or running jobs.
+
+    Jobs never wait on the reader: a job whose events would take the
+    backlog past SESSION_EVENT_BUFFER is cancelled, and when the last
+    subscriber goes away every job is cancelled, so an abandoned session
+    cannot hold model scheduler slots. Lifecycle events get another
+    SESSION_LIFECYCLE_BUFFER of room so the reader learns which jobs to
+    resubmit; past that, the oldest undelivered events are dropped.
+    """
+
+    def __init__(self, session_id: str, bible_service: BibleService,
+                 max_concurrent_jobs: int = Config.SESSION_MAX_CONCURRENT_JOBS):
+        self.session_id = session_id
+        self.bible_service = bible_service
+        self.max_concurrent_jobs = max_concurrent_jobs
+        # Job events are capped in _publish and lifecycle events in _publish_lifecycle
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.subscribed = False
+        self.last_active = time.monotonic()
+        self._jobs: Dict[str, SessionJob] = {}
+        self._queued: List[Tuple[int, int, SessionJob]] = []
+        self._sequence = itertools.count()
+        self._running = 0
+        self._closed = False
+
+    async def submit(self, request: SessionJobRequest) -> str:
+        if request.kind == "strongs" and not request.word:
+            raise ValueError("Strong's jobs require a word")
+        if len(self._jobs) >= Config.SESSION_MAX_JOBS:
+            raise SessionLimitReached(f"Session has {len(self._jobs)} unfinished jobs")
+
+        job = SessionJob(uuid.uuid4().hex[:12], request)
+        self._jobs[job.job_id] = job
+        heapq.heappush(self._queued, (-request.priority, next(self._sequence), job))
+        self.last_active = time.monotonic()
+        self._publish_lifecycle(job, {"type": "job_queued", "kind": request.kind, "priority": request.priority})
+        self._dispatch()
+        return job.job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; returns False for unknown jobs."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+
+        job.cancelled = True
+        if job.task is not None:
+            job.task.cancel()
+        else:
+            # Still queued: drop it now
+            self._jobs.pop(job_id, None)
+            self._queued = [entry for entry in self._queued if entry[2] is not job]
+            heapq.heapify(self._queued)
+            self._publish_lifecycle(job, {"type": "job_cancelled", "reason": job.cancel_reason})
+        return True
+
+    def stream(self) -> AsyncGenerator[Dict[str, Any], None]:
+        """Return the session's event stream, with keepalives while it is idle.
+
+        A session has one subscriber; SessionBusy is raised while another
+        is connected. Queued jobs start once the stream is open, and when
+        the subscriber disconnects all jobs are cancelled.
+        """
+        if self.subscribed:
+            raise SessionBusy(f"Session {self.session_id} already has a subscriber")
+        return self._stream()
+
+    async def _stream(self) -> AsyncGenerator[Dict[str, Any], None]:
+        if self.subscribed:
+            # Lost a race with another subscriber between stream() and the first read
+            yield {"type": "error", "message": f"Session {self.session_id} already has a subscriber"}
+            return
+        self.subscribed = True
+        self._dispatch()
+        try:
+            yield {"type": "session_ready", "session_id": self.session_id}
+            while not self._closed:
+                if not self.events.empty():
+                    # Drain the backlog without a wait_for task per event
+                    yield self.events.get_nowait()
+                    continue
+                try:
+                    yield await asyncio.wait_for(self.events.get(), timeout=Config.SESSION_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield {"type": "keepalive"}
+        finally:
+            self.subscribed = False
+            self.last_active = time.monotonic()
+            self._cancel_all("unsubscribed")
+
+    async def close(self):
+        self._closed = True
+        self._queued.clear()
+        tasks = [job.task for job in self._jobs.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._jobs.clear()
+
+    def _cancel_all(self, reason: str):
+        for job in list(self._jobs.values()):
+            job.cancel_reason = reason
+            self.cancel(job.job_id)
+
+    def _dispatch(self):
+        while not self._closed and self.subscribed and self._running < self.max_concurrent_jobs and self._queued:
+            _, _, job = heapq.heappop(self._queued)
+            self._running += 1
+            job.task = asyncio.create_task(self._run(job))
+
+    async def _run(self, job: SessionJob):
+        try:
+            self._publish_lifecycle(job, {"type": "job_started"})
+            # aclosing releases the job's scheduler slot as soon as it stops early
+            async with aclosing(self._job_events(job.request)) as events:
+                async for event in events:
+                    if not job.cancelled and not self._publish(job, event):
+                        job.cancelled, job.cancel_reason = True, "overflow"
+                    if job.cancelled:
+                        # Stop here, not at the job's next suspension point
+                        raise asyncio.CancelledError
+            self._publish_lifecycle(job, {"type": "job_finished"})
+        except asyncio.CancelledError:
+            if not self._closed:
+                self._publish_lifecycle(job, {"type": "job_cancelled", "reason": job.cancel_reason})
+        finally:
+            self._jobs.pop(job.job_id, None)
+            self._running -= 1
+            self._dispatch()
+
+    def _job_events(self, request: SessionJobRequest):
+        if request.kind == "chapter_intro":
+            return self.bible_service.get_chapter_intro_stream(
+                request.book, request.chapter, priority=request.scheduling, parallel=request.parallel
+            )
+        return self.bible_service.get_strongs_analysis_stream(
+            request.book, request.chapter, request.word, priority=request.scheduling, verse=request.verse,
+            tiers=STRONGS_TIERS if request.deep else (FAST_TIER,)
+        )
+
+    def _publish(self, job: SessionJob, event: Dict[str, Any]) -> bool:
+        """Queue a job event; False when the reader is SESSION_EVENT_BUFFER events behind."""
+        if self.events.qsize() >= Config.SESSION_EVENT_BUFFER:
+            return False
+        self.events.put_nowait({"job_id": job.job_id, **event})
+        return True
+
+    def _publish_lifecycle(self, job: SessionJob, event: Dict[str, Any]):
+        """Queue a lifecycle event, dropping the oldest events once the backlog is full."""
+        while self.events.qsize() >= Config.SESSION_EVENT_BUFFER + Config.SESSION_LIFECYCLE_BUFFER:
+            self.events.get_nowait()
+        self.events.put_nowait({"job_id": job.job_id, **event})
+
+
+class SessionManager:
+    """Registry of reader sessions, keyed by a client-chosen session id."""
+
+    def __init__(self, bible_service: BibleService):
+        self.bible_service = bible_service
+        self._sessions: Dict[str, ReaderSession] = {}
+
+    async def get(self, session_id: str) -> ReaderSession:
+        """Return the session, creating it on first use.
+
+        Raises SessionLimitReached when SESSION_MAX_SESSIONS are live.
+        """
+        await self._reap_idle()
+        session = self._sessions.get(session_id)
+        if session is None:
+            if len(self._sessions) >= Config.SESSION_MAX_SESSIONS:
+                raise SessionLimitReached(f"{len(self._sessions)} sessions are open")
+            session = ReaderSession(session_id, self.bible_service)
+            self._sessions[session_id] = session
+        return session
+
+    def find(self, session_id: str) -> Optional[ReaderSession]:
+        return self._sessions.get(session_id)
+
+    async def close_all(self):
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        await asyncio.gather(*(session.close() for session in sessions))
+
+    async def _reap_idle(self):
+        """Close sessions nobody has subscribed to within the idle timeout."""
+        deadline = time.monotonic() - Config.SESSION_IDLE_TIMEOUT
+        idle = [session_id for session_id, session in self._sessions.items()
+                if not session.subscribed and session.last_active < deadline]
+        for session_id in idle:
+            await self._sessions.pop(session_id).close()
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import time
+import zlib
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional, Tuple
+from config import Config
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+class _FrameEncoder:
+    """Encodes events to `data: {json}` frames byte-identical to `json.dumps`.
+
+    Most streamed events differ only in their last, string-valued field (the
+    token text), so everything before it is rendered once per distinct head
+    and reused; only the tail string is encoded per event.
+    """
+
+    MAX_PREFIXES = 1024
+
+    def __init__(self):
+        self._prefixes: Dict[Tuple, bytes] = {}
+
+    def encode(self, event: Dict[str, Any]) -> bytes:
+        items = tuple(event.items())
+        if items and isinstance(items[-1][1], str):
+            head = items[:-1]
+            try:
+                prefix = self._prefixes.get(head)
+            except TypeError:  # unhashable head value, e.g. a nested dict
+                prefix = b""
+            if prefix is None:
+                prefix = self._render_prefix(head, items[-1][0])
+                if len(self._prefixes) >= self.MAX_PREFIXES:
+                    self._prefixes.clear()
+                self._prefixes[head] = prefix
+            if prefix:
+                return prefix + json.dumps(items[-1][1]).encode("utf-8") + b"}\n\n"
+        return b"data: " + json.dumps(event).encode("utf-8") + b"\n\n"
+
+    @staticmethod
+    def _render_prefix(head: Tuple, tail_key: str) -> bytes:
+        rendered_head = json.dumps(dict(head))[:-1]
+        separator = ", " if head else ""
+        return f"data: {rendered_head}{separator}{json.dumps(tail_key)}: ".encode("utf-8")
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=5)
+        else:
+            self._zlib = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress and flush, so the client can decode everything sent so far."""
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class SSEWriter:
+    """Turns an event stream into response body chunks.
+
+    Frames are coalesced: a batch is written once it reaches `coalesce_bytes`
+    or once `coalesce_ms` has passed since its first frame, whichever comes
+    first. A `coalesce_ms` of 0 writes every frame as soon as it arrives.
+    With an `encoding` ("gzip" or "br") each batch is compressed and flushed
+    on its own, so compression never delays delivery beyond the batch window.
+    """
+
+    def __init__(self, coalesce_ms: float = Config.SSE_COALESCE_MS,
+                 coalesce_bytes: int = Config.SSE_COALESCE_BYTES,
+                 encoding: Optional[str] = None):
+        self.coalesce_ms = coalesce_ms
+        self.coalesce_bytes = coalesce_bytes
+        self.encoding = encoding
+        self._encoder = _FrameEncoder()
+
+    @classmethod
+    def for_request(cls, accept_encoding: str) -> "SSEWriter":
+        """Build a writer using the configured compression the client accepts."""
+        return cls(encoding=cls.negotiate_encoding(Config.SSE_COMPRESSION, accept_encoding))
+
+    @staticmethod
+    def negotiate_encoding(configured: str, accept_encoding: str) -> Optional[str]:
+        accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+        if configured in ("br", "auto") and brotli is not None and "br" in accepted:
+            return "br"
+        if configured in ("gzip", "auto") and "gzip" in accepted:
+            return "gzip"
+        return None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        if self.encoding is None:
+            return {}
+        return {"Content-Encoding": self.encoding, "Vary": "Accept-Encoding"}
+
+    async def stream(self, events: AsyncIterator[Dict[str, Any]]) -> AsyncGenerator[bytes, None]:
+        compressor = _Compressor(self.encoding) if self.encoding else None
+
+        def output(data: bytes) -> bytes:
+            return compressor.compress(data) if compressor else data
+
+        if self.coalesce_ms <= 0:
+            async for event in events:
+                yield output(self._encoder.encode(event))
+        else:
+            async for batch in self._batches(events):
+                yield output(batch)
+
+        if compressor:
+            yield compressor.finish()
+
+    async def _batches(self, events: AsyncIterator[Dict[str, Any]]) -> AsyncGenerator[bytes, None]:
+        # A pump task reads the source so the flush timer can fire while the
+        # upstream is quiet without cancelling the source generator.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=256)
+        done = object()
+
+        async def pump():
+            try:
+                async for event in events:
+                    await queue.put(event)
+            except Exception:
+                await queue.put(done)
+                raise
+            await queue.put(done)
+
+        pump_task = asyncio.create_task(pump())
+        buffer = bytearray()
+        deadline = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    item = None
+
+                if item is done:
+                    break
+                if item is not None:
+                    if not buffer:
+                        deadline = time.monotonic() + self.coalesce_ms / 1000
+                    buffer += self._encoder.encode(item)
+
+                if buffer and (item is None or len(buffer) >= self.coalesce_bytes
+                               or time.monotonic() >= deadline):
+                    yield bytes(buffer)
+                    buffer.clear()
+                    deadline = None
+
+            if buffer:
+                yield bytes(buffer)
+            # Surface errors raised by the source
+            await pump_task
+        finally:
+            if not pump_task.done():
+                pump_task.cancel()
+                await asyncio.gather(pump_task, return_exceptions=True)
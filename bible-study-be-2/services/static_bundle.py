@@ -0,0 +1,164 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+from config import Config
+from models.schemas import ChapterIntro, StrongsAnalysis
+from services.cache_service import CacheService
+from services.prompts import STRONGS_VERSION, content_versions
+
+MANIFEST_FILE = "manifest.json"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+ROUTE_CACHE_CONTROL = "public, max-age=300, must-revalidate"
+
+
+def render_complete_event(data: Dict[str, Any]) -> bytes:
+    """Render a payload exactly as the live stream's final `complete` frame."""
+    return f"data: {json.dumps({'type': 'complete', 'data': data})}\n\n".encode("utf-8")
+
+
+def _write_file(path: str, content: bytes) -> None:
+    """Write via a temporary file and rename, so an interrupted export leaves no partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def _write_object(objects_dir: str, body: bytes, version: Optional[str]) -> Dict[str, Any]:
+    digest = hashlib.sha256(body).hexdigest()
+    raw_path = os.path.join(objects_dir, digest[:2], digest)
+    compressed = gzip.compress(body, compresslevel=9, mtime=0)
+
+    # Each file is checked on its own; a size mismatch is a truncated file from an older export
+    for path, content in ((raw_path, body), (raw_path + ".gz", compressed)):
+        try:
+            complete = os.path.getsize(path) == len(content)
+        except OSError:
+            complete = False
+        if not complete:
+            _write_file(path, content)
+
+    return {"object": digest, "version": version, "size": len(body), "gzip_size": len(compressed)}
+
+
+def export_bundle(cache: CacheService, out_dir: str) -> Dict[str, Any]:
+    """Render every cached intro and Strong's analysis into a static bundle.
+
+    Objects are stored by the SHA-256 of their body, each alongside a
+    pre-gzipped copy, and `manifest.json` maps API routes to objects and
+    the content version that produced them. Re-exporting only writes
+    objects whose content changed.
+    """
+    objects_dir = os.path.join(out_dir, "objects")
+    routes: Dict[str, Dict[str, Any]] = {}
+
+    for key, entry in cache.entries(CacheService.CHAPTER_INTRO):
+        intro = ChapterIntro(**entry["data"])
+        routes[f"/chapter-info/{key}"] = _write_object(
+            objects_dir, render_complete_event(intro.model_dump()), entry["version"]
+        )
+
+    shared = {}
+    for key, entry in cache.entries(CacheService.STRONGS):
+        analysis = StrongsAnalysis(**entry["data"])
+        shared[key] = entry
+        routes[f"/strongs-info/{key}"] = _write_object(
+            objects_dir, render_complete_event(analysis.model_dump()), entry["version"]
+        )
+
+    for key, entry in cache.entries(CacheService.STRONGS_VERSE):
+        shared_entry = shared.get(key.rsplit("/", 1)[0])
+        if shared_entry is None:
+            continue
+        analysis = StrongsAnalysis(**{**shared_entry["data"], "contextual_meaning": entry["data"]})
+        # A verse route is current only while both of its parts are
+        version = entry["version"] if shared_entry["version"] == STRONGS_VERSION else None
+        routes[f"/strongs-info/{key}"] = _write_object(
+            objects_dir, render_complete_event(analysis.model_dump()), version
+        )
+
+    manifest = {"content_versions": content_versions(), "routes": routes}
+    _write_file(os.path.join(out_dir, MANIFEST_FILE),
+                json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8"))
+    return manifest
+
+
+class StaticBundle:
+    """Serves pre-rendered responses from an exported bundle directory."""
+
+    def __init__(self, bundle_dir: str = Config.STATIC_BUNDLE_DIR):
+        self.bundle_dir = bundle_dir
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._manifest_mtime: Optional[float] = None
+
+    def _refresh(self) -> None:
+        """Reload the manifest if a new export replaced it."""
+        path = os.path.join(self.bundle_dir, MANIFEST_FILE)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            self._routes, self._manifest_mtime = {}, None
+            return
+        if mtime == self._manifest_mtime:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._routes = json.load(f).get("routes", {})
+            self._manifest_mtime = mtime
+        except (OSError, ValueError):
+            self._routes = {}
+
+    def lookup(self, route: str) -> Optional[Dict[str, Any]]:
+        self._refresh()
+        return self._routes.get(route)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.bundle_dir, "objects", digest[:2], digest)
+
+    def _file_response(self, request: Request, digest: str, cache_control: str) -> Response:
+        headers = {
+            "ETag": f'"{digest}"',
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+            "Access-Control-Allow-Origin": "*",
+        }
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+
+        path = self._object_path(digest)
+        if "gzip" in request.headers.get("accept-encoding", "") and os.path.exists(path + ".gz"):
+            path += ".gz"
+            headers["Content-Encoding"] = "gzip"
+        # FileResponse streams with sendfile where the server supports it
+        return FileResponse(path, media_type="text/plain", headers=headers)
+
+    def route_response(self, request: Request, route: str, version: str) -> Optional[Response]:
+        """Return the pre-rendered response for an API route, or None on a miss.
+
+        Objects exported under another content version count as misses, so
+        the live path can serve them stale and regenerate them.
+        """
+        entry = self.lookup(route)
+        if entry is None or entry.get("version") != version:
+            return None
+        if not os.path.exists(self._object_path(entry["object"])):
+            return None
+        return self._file_response(request, entry["object"], ROUTE_CACHE_CONTROL)
+
+    def object_response(self, request: Request, digest: str) -> Optional[Response]:
+        """Return a content-addressed object; safe to cache forever."""
+        if len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+            return None
+        if not os.path.exists(self._object_path(digest)):
+            return None
+        return self._file_response(request, digest, IMMUTABLE_CACHE_CONTROL)
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+import re
+import tempfile
+from typing import Any, Dict, List, Tuple
+from config import Config
+
+WHITESPACE = re.compile(r"\s+")
+
+
+class VerseStore:
+    """Local Bible text, filled by import_verses.py.
+
+    Chapters live at `{store_dir}/{BOOK}/{chapter}.json` as a JSON object
+    mapping verse numbers to verse text. Optional Strong's alignments sit
+    next to them in `{chapter}.strongs.json`, mapping verse numbers to
+    [English words, Strong's number] pairs. Missing chapters read as empty, so
+    callers degrade gracefully when no text has been installed, but
+    verse-scoped prompts then fall back to the model's memory of the verse.
+    """
+
+    MAX_CACHED_CHAPTERS = 256
+
+    def __init__(self, store_dir: str = Config.VERSE_STORE_DIR):
+        self.store_dir = store_dir
+        self._chapters: Dict[str, Dict[int, str]] = {}
+        self._tags: Dict[str, Dict[int, List[Tuple[str, str]]]] = {}
+
+    def chapter(self, book: str, chapter: int) -> Dict[int, str]:
+        """Return {verse number: text} for a chapter."""
+        key = f"{book.upper()}/{chapter}"
+        verses = self._chapters.get(key)
+        if verses is None:
+            try:
+                with open(os.path.join(self.store_dir, book.upper(), f"{chapter}.json"), "r", encoding="utf-8") as f:
+                    verses = {int(number): text for number, text in json.load(f).items()}
+            except (OSError, ValueError):
+                logging.warning(f"No verse text for {key} in {self.store_dir}; run import_verses.py")
+                verses = {}
+            if len(self._chapters) >= self.MAX_CACHED_CHAPTERS:
+                self._chapters.clear()
+            self._chapters[key] = verses
+        return verses
+
+    def strongs_tags(self, book: str, chapter: int) -> Dict[int, List[Tuple[str, str]]]:
+        """Return {verse number: [(English words, Strong's number)]} for a chapter, empty if not imported."""
+        key = f"{book.upper()}/{chapter}"
+        tags = self._tags.get(key)
+        if tags is None:
+            try:
+                with open(os.path.join(self.store_dir, book.upper(), f"{chapter}.strongs.json"), "r",
+                          encoding="utf-8") as f:
+                    tags = {int(number): [(english, strongs) for english, strongs in pairs]
+                            for number, pairs in json.load(f).items()}
+            except (OSError, ValueError):
+                tags = {}
+            if len(self._tags) >= self.MAX_CACHED_CHAPTERS:
+                self._tags.clear()
+            self._tags[key] = tags
+        return tags
+
+    def chapter_text(self, book: str, chapter: int) -> str:
+        verses = self.chapter(book, chapter)
+        return " ".join(verses[number] for number in sorted(verses))
+
+    def window(self, book: str, chapter: int, verse: int, radius: int) -> Dict[int, str]:
+        """Return a verse and up to `radius` verses on each side of it."""
+        verses = self.chapter(book, chapter)
+        return {number: verses[number] for number in range(verse - radius, verse + radius + 1) if number in verses}
+
+    def save_chapter(self, book: str, chapter: int, verses: Dict[int, str]) -> None:
+        """Atomically write a chapter's text."""
+        self._write(book, f"{chapter}.json", {str(number): text for number, text in sorted(verses.items())})
+        self._chapters.pop(f"{book.upper()}/{chapter}", None)
+
+    def save_strongs_tags(self, book: str, chapter: int, tags: Dict[int, List[Tuple[str, str]]]) -> None:
+        """Atomically write a chapter's Strong's alignment."""
+        self._write(book, f"{chapter}.strongs.json",
+                    {str(number): [list(pair) for pair in pairs] for number, pairs in sorted(tags.items())})
+        self._tags.pop(f"{book.upper()}/{chapter}", None)
+
+    def _write(self, book: str, filename: str, content: Dict[str, Any]) -> None:
+        directory = os.path.join(self.store_dir, book.upper())
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(content, f, ensure_ascii=False)
+            os.replace(tmp_path, os.path.join(directory, filename))
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def verses_from_api(chapter_data: Dict[str, Any]) -> Dict[int, str]:
+        """Extract {verse number: text} from a Free Use Bible API chapter.
+
+        Verse content is rendered as the reader renders it: strings and
+        poem lines are kept, footnote markers and line breaks become spaces.
+        """
+        verses = {}
+        for block in chapter_data["chapter"]["content"]:
+            if block.get("type") != "verse":
+                continue
+            parts = []
+            for item in block.get("content", []):
+                if isinstance(item, str):
+                    parts.append(item)
+                elif item.get("text"):
+                    parts.append(item["text"])
+                else:
+                    parts.append(" ")
+            text = WHITESPACE.sub(" ", " ".join(parts)).strip()
+            if text:
+                verses[int(block["number"])] = text
+        return verses
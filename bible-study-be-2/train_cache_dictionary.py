@@ -0,0 +1,42 @@
+"""Train a compression dictionary from cached entries and install it.
+
+Usage: python train_cache_dictionary.py [--cache-dir cache] [--samples 2000] [--recompress]
+"""
+import argparse
+import random
+from config import Config
+from services import codec
+from services.cache_service import CacheService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cache-dir", default=Config.CACHE_DIR)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=codec.ZLIB_MAX_DICTIONARY)
+    parser.add_argument("--recompress", action="store_true",
+                        help="rewrite existing entries with the new dictionary")
+    args = parser.parse_args()
+
+    cache = CacheService(args.cache_dir)
+    entries = [(kind, key, entry)
+               for kind in CacheService.MODELS
+               for key, entry in cache.entries(kind)]
+    if not entries:
+        print(f"No cached entries in {args.cache_dir}")
+        return
+
+    sample = random.Random(0).sample(entries, min(args.samples, len(entries)))
+    dictionary = codec.train_dictionary(
+        [(CacheService.MODELS[kind], entry["data"]) for kind, _, entry in sample], args.size)
+    dict_id = cache.install_dictionary(dictionary)
+    print(f"Installed dictionary {dict_id:08x} ({len(dictionary)} bytes) from {len(sample)} entries")
+
+    if args.recompress:
+        for kind, key, entry in entries:
+            cache.set(kind, key, entry["data"], entry["version"], entry["request"])
+        print(f"Recompressed {len(entries)} entries")
+
+
+if __name__ == "__main__":
+    main()